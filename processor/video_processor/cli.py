@@ -45,11 +45,39 @@ Kullanım örnekleri:
         default=15,
         help="Her kaç karede bir işlem yapılacağı (varsayılan: 15)")
     
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=8,
+        help="Tek OCR çağrısında işlenecek kare sayısı (varsayılan: 8)")
+    
     parser.add_argument(
         "--cpu",
         action="store_true",
         help="CPU kullan (varsayılan: GPU kullanır)")
     
+    parser.add_argument(
+        "--precision",
+        choices=["fp16", "fp32"],
+        default="fp16",
+        help="GPU hassasiyeti: fp16 (TensorRT, ilk çalıştırmada motor derlenir) ya da fp32 (varsayılan: fp16)")
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="CPU modunda paralel süreç sayısı (varsayılan: otomatik)")
+    
+    parser.add_argument(
+        "--roi",
+        action="store_true",
+        help="OCR'ı sadece hareketli yatay banda uygula (altyazılı videolar için)")
+    
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Neredeyse aynı kareler için OCR sonuç önbelleğini kapat (her kare OCR'dan geçer)")
+    
     # Yardımcı seçenekler
     parser.add_argument(
         "--verbose", "-v",
@@ -80,6 +108,14 @@ def validate_inputs(args):
     if args.step <= 0:
         errors.append("❌ Step değeri pozitif bir sayı olmalıdır")
     
+    # Süreç sayısı kontrolü
+    if args.workers is not None and args.workers <= 0:
+        errors.append("❌ Süreç sayısı pozitif bir sayı olmalıdır")
+    
+    # Batch boyutu kontrolü
+    if args.batch_size <= 0:
+        errors.append("❌ Batch boyutu pozitif bir sayı olmalıdır")
+    
     return errors
 
 
@@ -102,7 +138,8 @@ def main():
     print(f"📹 Video: {args.video}")
     print(f"📄 Çıktı: {args.out}")
     print(f"⚙️  Step: {args.step}")
-    print(f"🖥️  İşlemci: {'CPU' if args.cpu else 'GPU'}")
+    print(f"📦 Batch: {args.batch_size}")
+    print(f"🖥️  İşlemci: {'CPU' if args.cpu else f'GPU ({args.precision.upper()})'}")
     print("-" * 40)
     
     try:
@@ -111,7 +148,12 @@ def main():
             video_path=args.video,
             out_path=args.out,
             step=args.step,
-            gpu=not args.cpu
+            gpu=not args.cpu,
+            batch_size=args.batch_size,
+            roi=args.roi,
+            workers=args.workers,
+            precision=args.precision,
+            cache=not args.no_cache
         )
         
         return 0
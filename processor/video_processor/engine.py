@@ -5,13 +5,207 @@ Video karelerini okur → OCR uygular → sonuçları kaydeder
 """
 
 from .io.extractor import FrameExtractor
-from .ocr.paddle import PaddleOCRWrapper
+from .ocr.paddle import PaddleOCRWrapper, MAX_INPUT_SIZE
+from .ocr.cache import OCRResultCache, frame_signature, hamming, is_blank, same_frame
+from .ocr.roi import RoiTracker
 from .io.writer import JsonWriter
-from .io.simple_db import SimpleRowWriter  # ← DB yazıcı eklendi
+from .io.simple_db import SimpleRowWriter, make_row  # ← DB yazıcı eklendi
 import os
+import sys
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 
+# Aşamalar arası kuyruk boyutu (bellekte bekleyen en fazla kare/sonuç)
+PREFETCH = 8
 
-def run_pipeline(video_path, out_path, *, step=15, gpu=True):
+# Tek OCR çağrısında işlenecek varsayılan kare sayısı
+BATCH_SIZE = 8
+
+# DB'ye toplu yazım eşikleri (satır sayısı / saniye)
+DB_BATCH_ROWS = 500
+DB_FLUSH_SEC = 1.0
+
+# Canlı çıktının toplu basılma eşikleri (satır sayısı / saniye)
+LIVE_FLUSH_LINES = 20
+LIVE_FLUSH_SEC = 0.25
+
+# CPU modunda varsayılan en fazla süreç sayısı (her süreç kendi modelini yükler)
+MAX_CPU_WORKERS = 4
+
+# Okuma kuyruğu bu kadar boş kalırsa eksik batch beklemeden işlenir (saniye)
+BATCH_IDLE_SEC = 0.05
+
+# Kuyruklarda akış sonunu bildiren işaret
+_EOF = None
+
+# Okuma kuyruğu boş kaldığında biriken batch'i işleten işaret
+_IDLE = object()
+
+
+def _fmt_mmss(s: float) -> str:
+    """Saniyeyi [MM:SS] formatına çevirir"""
+    total_ms = int(round(s * 1000))
+    mm, ss = divmod(total_ms // 1000, 60)
+    return f"[{mm:02d}:{ss:02d}]"
+
+
+def _flush_lines(lines):
+    """Biriken canlı çıktı satırlarını tek write + flush ile basar"""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+        lines.clear()
+
+
+def _reader_worker(extractor, read_q, errors):
+    """Video karelerini decode edip okuma kuyruğuna koyar"""
+    try:
+        for item in extractor:
+            read_q.put(item)
+    except Exception as e:
+        errors.append(e)
+    finally:
+        read_q.put(_EOF)
+
+
+def _iter_queue(read_q, idle_sec=BATCH_IDLE_SEC):
+    """
+    Okuma kuyruğundaki kareleri akış sonuna kadar döner
+
+    Kuyruk idle_sec boyunca boş kalırsa _IDLE döner (yavaş decode'da
+    eksik batch'in beklemeden işlenmesi için).
+    """
+    while True:
+        try:
+            item = read_q.get(timeout=idle_sec)
+        except queue.Empty:
+            yield _IDLE
+            item = read_q.get()
+        if item is _EOF:
+            return
+        yield item
+
+
+def _ocr_batch(ocr, buf, cache, roi_tracker=None, release=None):
+    """
+    Bir batch kareyi tanır; önbellekteki ve boş kareler için OCR atlanır
+
+    Args:
+        ocr (BaseOCR): OCR motoru
+        buf (list): (kare_indeksi, kare, zaman_saniye) listesi
+        cache (OCRResultCache): Neredeyse aynı kareler için sonuç önbelleği
+            (None: önbellek ve batch içi tekilleştirme kapalı)
+        roi_tracker (RoiTracker): Verilirse OCR girişi aktif banda kırpılır
+        release (callable): Kare tamponunu havuza iade eden fonksiyon
+
+    Returns:
+        list: Giriş sırasıyla (zaman_saniye, sonuçlar) listesi
+    """
+    signatures = [frame_signature(frame) for _, frame, _ in buf]
+    batch_results = [cache.get(key, thumb) if cache is not None else None
+                     for key, thumb in signatures]
+    if roi_tracker is not None:
+        bands = [roi_tracker.update(frame) for _, frame, _ in buf]
+
+    # Önbellekte olmayan kareleri batch içinde de tekilleştir
+    pending = []  # (hash, önizleme) → OCR'a gidecek kare sırası (liste indeksi)
+    owners = {}   # buf sırası → OCR'a gidecek kare sırası
+    misses = []
+    offsets = []  # kırpılan karelerin y ofseti
+    for i, ((key, thumb), results) in enumerate(zip(signatures, batch_results)):
+        if results is not None:
+            continue
+        # Boş kareler (düz renk, kararma) OCR'a hiç gitmez
+        if is_blank(thumb):
+            batch_results[i] = []
+            continue
+        j = None
+        if cache is not None:
+            j = next((m for m, (k, t) in enumerate(pending)
+                      if hamming(key, k) <= cache.tolerance and same_frame(thumb, t)), None)
+        if j is None:
+            j = len(misses)
+            pending.append((key, thumb))
+            frame = buf[i][1]
+            y_top = 0
+            if roi_tracker is not None:
+                y_top, y_bottom = bands[i]
+                frame = frame[y_top:y_bottom]
+            misses.append(frame)
+            offsets.append(y_top)
+        owners[i] = j
+
+    if misses:
+        fresh = ocr.recognize_batch(misses)
+        # Kırpılan karelerde bbox y koordinatlarını tam kareye geri taşı
+        for j, y_top in enumerate(offsets):
+            if y_top:
+                fresh[j] = [((x1, y1 + y_top, x2, y2 + y_top), txt, conf)
+                            for (x1, y1, x2, y2), txt, conf in fresh[j]]
+        if cache is not None:
+            for j, (key, thumb) in enumerate(pending):
+                cache.put(key, thumb, fresh[j])
+        for i, j in owners.items():
+            batch_results[i] = fresh[j]
+
+    # Kareler artık kullanılmıyor → tamponları extractor havuzuna iade et
+    if release is not None:
+        for _, frame, _ in buf:
+            release(frame)
+
+    return [(ts, results) for (_, _, ts), results in zip(buf, batch_results)]
+
+
+def _ocr_stream(ocr, items, batch_size, cache, roi_tracker=None, release=None):
+    """Kareleri batch_size'lık gruplar halinde tanıyıp (zaman, sonuçlar) döner"""
+    buf = []
+    for item in items:
+        # Kaynak boşta → biriken kareleri beklemeden işle
+        if item is _IDLE:
+            if buf:
+                yield from _ocr_batch(ocr, buf, cache, roi_tracker, release)
+                buf.clear()
+            continue
+
+        buf.append(item)
+
+        # Her batch'teki karelerin metinlerini tek çağrıda tanı
+        if len(buf) >= batch_size:
+            yield from _ocr_batch(ocr, buf, cache, roi_tracker, release)
+            buf.clear()
+
+    # Akış sonunda kalan kareler
+    if buf:
+        yield from _ocr_batch(ocr, buf, cache, roi_tracker, release)
+
+
+def _ocr_shard(video_path, step, start, end, batch_size, roi, cpu_threads=None, use_cache=True):
+    """
+    Ayrı bir süreçte videonun [start, end) kare aralığını tanır (CPU modu)
+
+    Returns:
+        tuple: ((zaman_saniye, sonuçlar) listesi, önbellek isabet sayısı)
+    """
+    extractor = FrameExtractor(video_path, step, start=start, end=end, verbose=False,
+                               max_size=MAX_INPUT_SIZE)
+    ocr = PaddleOCRWrapper(gpu=False, frame_cache=False, cpu_threads=cpu_threads)
+    cache = OCRResultCache() if use_cache else None
+    roi_tracker = RoiTracker() if roi else None
+    results = list(_ocr_stream(ocr, extractor, batch_size, cache, roi_tracker, extractor.release))
+    return results, cache.hits if cache is not None else 0
+
+
+def _cpu_workers(workers):
+    """CPU modunda kullanılacak süreç sayısını belirler"""
+    if workers is None:
+        workers = min(MAX_CPU_WORKERS, (os.cpu_count() or 1) // 2)
+    return max(1, workers)
+
+
+def run_pipeline(video_path, out_path, *, step=15, gpu=True, batch_size=BATCH_SIZE,
+                 roi=False, workers=None, precision="fp16", cache=True):
     """
     Video işleme pipeline'ını çalıştırır
     
@@ -20,15 +214,30 @@ def run_pipeline(video_path, out_path, *, step=15, gpu=True):
         out_path (str): Çıktı JSON dosyasının yolu
         step (int): Her kaç karede bir işlem yapılacağı (varsayılan: 15)
         gpu (bool): GPU kullanımı (varsayılan: True)
+        batch_size (int): Tek OCR çağrısındaki kare sayısı (varsayılan: 8)
+        roi (bool): OCR'ı sadece hareketli yatay banda uygula (varsayılan: False)
+        workers (int): CPU modunda paralel süreç sayısı (varsayılan: otomatik)
+        precision (str): GPU hassasiyeti, "fp16" (TensorRT) ya da "fp32" (varsayılan: "fp16")
+        cache (bool): Neredeyse aynı kareler için OCR sonuç önbelleği (varsayılan: True)
     
     Returns:
         None
     """
     print(f"🎬 Video yükleniyor: {video_path}")
-    extractor = FrameExtractor(video_path, step)
+    # Büyük kareler okuma thread'inde OCR giriş boyutuna küçültülür → OCR ile
+    # örtüşür ve kuyrukta bekleyen kareler daha az bellek tutar
+    extractor = FrameExtractor(video_path, step, max_size=MAX_INPUT_SIZE)
     
-    print(f"🤖 OCR motoru başlatılıyor (GPU: {gpu})")
-    ocr = PaddleOCRWrapper(gpu)
+    batch_size = max(1, batch_size)
+
+    # CPU modunda video kare aralıklarına bölünüp ayrı süreçlerde işlenir
+    workers = 1 if gpu else _cpu_workers(workers)
+    sharded = workers > 1 and extractor.frame_count > 0
+
+    if not sharded:
+        print(f"🤖 OCR motoru başlatılıyor (GPU: {gpu})")
+        # Kareler zaten OCRResultCache'ten geçtiği için wrapper önbelleği kapalı
+        ocr = PaddleOCRWrapper(gpu, frame_cache=False, precision=precision)
     
     print(f"📝 Çıktı dosyası: {out_path}")
     writer = JsonWriter(out_path)
@@ -38,38 +247,129 @@ def run_pipeline(video_path, out_path, *, step=15, gpu=True):
     file_name = os.path.basename(video_path)
     
     frame_count = 0
-    text_count = 0
-    
+    counts = {"text": 0, "cached": 0}
+
+    read_q = queue.Queue(maxsize=PREFETCH)
+    write_q = queue.Queue(maxsize=PREFETCH)
+    errors = []
+
+    def _writer_worker():
+        """OCR sonuçlarını JSON/DB'ye yazar ve canlı çıktıyı basar"""
+        db_rows = []
+        last_flush = time.monotonic()
+        live_lines = []
+        last_print = time.monotonic()
+        eof = False  # _EOF okundu mu (okunduysa kuyrukta beklenecek bir şey kalmaz)
+        try:
+            while True:
+                item = write_q.get()
+                if item is _EOF:
+                    eof = True
+                    break
+                ts, results = item
+
+                # Tek geçişte: JSON’a ekle, DB satırı hazırla, canlı çıktı topla
+                texts = []
+                for bbox, txt, conf in results:
+                    txt = txt.strip()
+                    writer.add(ts, bbox, txt, conf)  # JSON’a ekle
+                    counts["text"] += 1
+                    if txt:
+                        texts.append(txt)
+                        db_rows.append(make_row(file_name, txt, ts, conf))
+
+                # DB’ye toplu ekle (satır başına commit yerine)
+                if len(db_rows) >= DB_BATCH_ROWS or time.monotonic() - last_flush >= DB_FLUSH_SEC:
+                    db.insert_detections(db_rows)
+                    db_rows.clear()
+                    last_flush = time.monotonic()
+
+                # Canlı çıktı → her karede bir satır; satırlar biriktirilip
+                # periyodik basılır (her print'te stdout flush beklenmez)
+                if texts:
+                    joined = " | ".join(texts)
+                    live_lines.append(f"  {_fmt_mmss(ts)} - {joined}")
+                else:
+                    live_lines.append(f"  {_fmt_mmss(ts)} - (metin yok)")
+
+                if len(live_lines) >= LIVE_FLUSH_LINES or time.monotonic() - last_print >= LIVE_FLUSH_SEC:
+                    _flush_lines(live_lines)
+                    last_print = time.monotonic()
+
+            db.insert_detections(db_rows)
+        except Exception as e:
+            errors.append(e)
+            # Kalan sonuçları boşalt ki ana thread kuyrukta kilitlenmesin
+            while not eof and write_q.get() is not _EOF:
+                pass
+        finally:
+            _flush_lines(live_lines)
+            db.close()
+
     print("🔄 İşlem başlıyor...")
-    
-    for idx, frame, ts in extractor:
+
+    writer_thread = threading.Thread(target=_writer_worker, daemon=True)
+    writer_thread.start()
+
+    def _emit(ts, results):
+        """Tanınan kareyi yazma kuyruğuna aktarır"""
+        nonlocal frame_count
+        write_q.put((ts, results))
         frame_count += 1
-        
-        # Her karedeki metinleri tanı
-        results = list(ocr.recognize(frame))
-        for bbox, txt, conf in results:
-            writer.add(ts, bbox, txt, conf)  # JSON’a ekle
-            db.insert_detection(file_name, txt, ts, conf)  # DB’ye ekle
-            text_count += 1
-
-        # Canlı çıktı → her karede bir satırda yaz
-        texts = [txt.strip() for _, txt, _ in results if txt.strip()]
-        
-        def _fmt_mmss(s):
-            total_ms = int(round(s * 1000))
-            mm, ss = divmod(total_ms // 1000, 60)
-            return f"[{mm:02d}:{ss:02d}]"
-
-        if texts:
-            joined = " | ".join(texts)
-            print(f"  {_fmt_mmss(ts)} - {joined}")
-        else:
-            print(f"  {_fmt_mmss(ts)} - (metin yok)")
-        
+
         # İlerleme göstergesi
         if frame_count % 10 == 0:
-            print(f"  📊 İşlenen kare: {frame_count}, Bulunan metin: {text_count}")
-    
+            print(f"  📊 İşlenen kare: {frame_count}, Bulunan metin: {counts['text']}")
+
+    try:
+        if sharded:
+            # Her süreç kendi extractor/OCR örneğiyle bir kare aralığını işler;
+            # sonuçlar aralık sırasıyla birleştirilir
+            n = extractor.frame_count
+            bounds = [i * n // workers for i in range(workers)]
+            # CAP_PROP_FRAME_COUNT birçok kapsayıcıda tahmindir; son parça
+            # grab() başarısız olana kadar okur ki sondaki kareler düşmesin
+            ends = bounds[1:] + [None]
+            extractor.close()
+            # Çekirdekler süreçler arasında paylaştırılır (aşırı thread'lenmeyi önler)
+            threads = max(1, (os.cpu_count() or 1) // workers)
+            print(f"🧩 CPU modu: {workers} süreç x {threads} thread")
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                shards = pool.map(_ocr_shard, [video_path] * workers, [step] * workers,
+                                  bounds, ends, [batch_size] * workers,
+                                  [roi] * workers, [threads] * workers, [cache] * workers)
+                for shard_results, hits in shards:
+                    counts["cached"] += hits
+                    for ts, results in shard_results:
+                        _emit(ts, results)
+        else:
+            # Decode → OCR → yazma aşamaları ayrı thread'lerde örtüşerek çalışır.
+            # OCR yalnızca bu (ana) thread'de çağrıldığı için kilit gerekmez.
+            reader = threading.Thread(target=_reader_worker, args=(extractor, read_q, errors),
+                                      daemon=True)
+            reader.start()
+
+            # Neredeyse aynı kareler (sabit altyazı, yavaş sahne) için OCR önbelleği
+            result_cache = OCRResultCache() if cache else None
+
+            # Opsiyonel: OCR girişini kareler arası hareketin olduğu banda kırp
+            roi_tracker = RoiTracker() if roi else None
+
+            for ts, results in _ocr_stream(ocr, _iter_queue(read_q), batch_size,
+                                           result_cache, roi_tracker, extractor.release):
+                _emit(ts, results)
+
+            reader.join()
+            counts["cached"] = result_cache.hits if result_cache is not None else 0
+    finally:
+        write_q.put(_EOF)
+        writer_thread.join()
+
+    if errors:
+        raise errors[0]
+
+    text_count = counts["text"]
+
     # Sonuçları kaydet (.txt)
     basename = os.path.splitext(os.path.basename(video_path))[0]
     text_output = f"{basename}.txt"
@@ -78,6 +378,7 @@ def run_pipeline(video_path, out_path, *, step=15, gpu=True):
     print(f"✅ İşlem tamamlandı!")
     print(f"   📈 Toplam kare: {frame_count}")
     print(f"   📝 Toplam metin: {text_count}")
+    print(f"   ♻️  Önbellekten gelen kare: {counts['cached']}")
     print(f"   💾 Sonuç dosyası: {text_output}")
 
 
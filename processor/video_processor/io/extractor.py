@@ -6,7 +6,10 @@ Video dosyasını kare kare okur ve zaman bilgisiyle birlikte döner.
 
 import cv2
 import numpy as np
-from typing import Iterator, Tuple
+from typing import Iterator, Optional, Tuple
+
+# Başlangıçta ayrılacak kare tamponu sayısı
+POOL_SIZE = 4
 
 
 class FrameExtractor:
@@ -17,17 +20,32 @@ class FrameExtractor:
     - Bellek verimli generator pattern
     - Zaman bilgisi (timestamp) desteği
     - Esnek kare atlama (step) ayarı
+    - Yeniden kullanılan kare tamponları (release ile havuza iade)
+    - Opsiyonel küçültme (OCR giriş boyutuna, okuma thread'inde)
     """
     
-    def __init__(self, video_path: str, step: int = 15):
+    def __init__(self, video_path: str, step: int = 15, start: int = 0,
+                 end: Optional[int] = None, verbose: bool = True,
+                 max_size: Optional[Tuple[int, int]] = None):
         """
         Args:
             video_path (str): Video dosyası yolu
             step (int): Her kaç karede bir işlem yapılacağı
+            start (int): İlk kare indeksi (dahil)
+            end (int): Son kare indeksi (hariç, varsayılan: video sonu)
+            verbose (bool): Video bilgilerini yazdır
+            max_size (tuple): Verilirse (genişlik, yükseklik) sınırını aşan kareler
+                INTER_AREA ile bu sınıra küçültülerek döner
         """
         self.video_path = video_path
         self.step = max(1, step)  # En az 1 olmalı
+        self.start = max(0, start)
+        self.end = end
+        self.verbose = verbose
+        self.max_size = max_size
         self.cap = None
+        self._pool = []
+        self._decode_buf = None
         
         # Video bilgilerini al
         self._init_video()
@@ -43,12 +61,32 @@ class FrameExtractor:
         self.fps = self.cap.get(cv2.CAP_PROP_FPS)
         self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
         self.duration = self.frame_count / self.fps if self.fps > 0 else 0
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+        # Dönen karelerin boyutu (max_size aşılıyorsa en-boy oranı korunarak küçültülür)
+        self.out_width, self.out_height = self.width, self.height
+        if self.max_size and self.width > 0 and self.height > 0:
+            max_width, max_height = self.max_size
+            scale = min(1.0, max_width / self.width, max_height / self.height)
+            self.out_width = int(self.width * scale)
+            self.out_height = int(self.height * scale)
+
+        # Kare tamponlarını önceden ayır (her karede yeni ndarray ayırmamak için)
+        if self.out_width > 0 and self.out_height > 0 and not self._pool:
+            self._pool = [np.empty((self.out_height, self.out_width, 3), np.uint8)
+                          for _ in range(POOL_SIZE)]
         
+        if not self.verbose:
+            return
         print(f"📊 Video bilgileri:")
         print(f"   🎞️  FPS: {self.fps:.2f}")
         print(f"   📏 Toplam kare: {self.frame_count}")
         print(f"   ⏱️  Süre: {self.duration:.2f} saniye")
         print(f"   ⚡ İşlenecek kare: ~{self.frame_count // self.step}")
+        if self._resizing():
+            print(f"   🔍 Kareler küçültülecek: {self.width}x{self.height} → "
+                  f"{self.out_width}x{self.out_height}")
     
     def __iter__(self) -> Iterator[Tuple[int, np.ndarray, float]]:
         """
@@ -59,29 +97,131 @@ class FrameExtractor:
         """
         if not self.cap or not self.cap.isOpened():
             self._init_video()
-        
-        frame_idx = 0
-        
+
         try:
-            while True:
-                ret, frame = self.cap.read()
-                
-                if not ret:
-                    break
-                
-                # Sadece belirtilen adımlarda işlem yap
-                if frame_idx % self.step == 0:
-                    # Zaman bilgisini al (milisaniye → saniye)
-                    timestamp_ms = self.cap.get(cv2.CAP_PROP_POS_MSEC)
-                    timestamp_sec = timestamp_ms / 1000.0
-                    
-                    yield frame_idx, frame, timestamp_sec
-                
-                frame_idx += 1
-                
+            if self._use_seek():
+                yield from self._iter_seek()
+            else:
+                yield from self._iter_grab()
         finally:
             self._cleanup()
-    
+
+    def _use_seek(self) -> bool:
+        """
+        Seek modunun kullanılıp kullanılmayacağına karar verir
+
+        Seek her seferinde codec'in referans karelerini geçersiz kılar
+        (keyframe'den yeniden decode), bu yüzden sadece step >= FPS gibi
+        büyük adımlarda grab()'dan daha ucuzdur.
+        """
+        return self.fps > 0 and self.frame_count > 0 and self.step >= int(self.fps)
+
+    def _iter_seek(self) -> Iterator[Tuple[int, np.ndarray, float]]:
+        """Büyük step değerleri için doğrudan hedef karelere atlar"""
+        stop = self.frame_count if self.end is None else min(self.end, self.frame_count)
+        # step'in katı olan ilk kare (aralıklar arasında örnekleme hizalı kalır)
+        first = -(-self.start // self.step) * self.step
+        next_idx = first
+        for target in range(first, stop, self.step):
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+            ret, frame = self.cap.read(self._decode_target())
+
+            if not ret:
+                return
+
+            yield target, self._fit(frame), self._timestamp(target)
+            next_idx = target + 1
+
+        # CAP_PROP_FRAME_COUNT birçok kapsayıcıda tahmindir; tahminin ötesindeki
+        # kareler (varsa) akış bitene (ya da end'e) kadar grab() ile sırayla
+        # okunur. Tahmin doğruysa en fazla step - 1 kare grab() edilir.
+        if self.end is None or self.end > stop:
+            if next_idx == first:
+                self.cap.set(cv2.CAP_PROP_POS_FRAMES, first)
+            yield from self._grab_from(next_idx)
+
+    def _acquire(self):
+        """Havuzdan boş bir kare tamponu alır (havuz boşsa None → OpenCV ayırır)"""
+        try:
+            return self._pool.pop()
+        except IndexError:
+            return None
+
+    def _resizing(self) -> bool:
+        """Karelerin küçültülüp küçültülmediğini döner"""
+        return (self.out_width, self.out_height) != (self.width, self.height)
+
+    def _decode_target(self):
+        """
+        Decode hedef tamponunu döner
+
+        Küçültme varsa tam boyutlu kare tek bir ara tampona decode edilir
+        (resize kopyaladığı için her karede yeniden kullanılabilir); yoksa
+        doğrudan havuzdaki tampona.
+        """
+        if not self._resizing():
+            return self._acquire()
+        if self._decode_buf is None:
+            self._decode_buf = np.empty((self.height, self.width, 3), np.uint8)
+        return self._decode_buf
+
+    def _fit(self, frame: np.ndarray) -> np.ndarray:
+        """Kareyi dönüş boyutuna küçültür (havuzdaki tampona yazarak)"""
+        if not self._resizing() or frame.shape[:2] != (self.height, self.width):
+            return frame
+        return cv2.resize(frame, (self.out_width, self.out_height),
+                          dst=self._acquire(), interpolation=cv2.INTER_AREA)
+
+    def release(self, frame: np.ndarray):
+        """
+        İşi biten kareyi tampon havuzuna iade eder
+
+        İade edilen kare bir sonraki okumada üzerine yazılır; bu yüzden
+        sadece kareye (ve görünümlerine) artık ihtiyaç kalmadığında çağrılmalıdır.
+        Hiç çağrılmazsa her kare için yeni tampon ayrılır.
+
+        Args:
+            frame (np.ndarray): Iterator'dan alınan kare
+        """
+        if (frame is not None and frame.shape == (self.out_height, self.out_width, 3)
+                and frame.dtype == np.uint8):
+            self._pool.append(frame)
+
+    def _timestamp(self, frame_idx: int) -> float:
+        """
+        Kare indeksinden zamanı (saniye) hesaplar
+
+        Her karede CAP_PROP_POS_MSEC sorgulamak yerine kayıtlı FPS kullanılır.
+        Sabit kare hızlı (CFR) videolarda birebir doğrudur; değişken kare
+        hızlı (VFR) videolarda küçük kaymalar olabilir.
+        """
+        return frame_idx / self.fps if self.fps > 0 else 0.0
+
+    def _iter_grab(self) -> Iterator[Tuple[int, np.ndarray, float]]:
+        """Küçük step değerleri için her kareyi grab() ile ilerletir"""
+        if self.start:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, self.start)
+        yield from self._grab_from(self.start)
+
+    def _grab_from(self, frame_idx: int) -> Iterator[Tuple[int, np.ndarray, float]]:
+        """Akışı mevcut konumdan (frame_idx) grab() ile ilerletip step'e denk gelen kareleri döner"""
+        while self.end is None or frame_idx < self.end:
+            # grab() sadece akışı ilerletir, kareyi decode etmez
+            ret = self.cap.grab()
+
+            if not ret:
+                break
+
+            # Sadece belirtilen adımlarda kareyi decode et (retrieve)
+            if frame_idx % self.step == 0:
+                ok, frame = self.cap.retrieve(self._decode_target())
+                if not ok:
+                    break
+
+                yield frame_idx, self._fit(frame), self._timestamp(frame_idx)
+
+            frame_idx += 1
+
     def get_frame_at_time(self, time_sec: float) -> np.ndarray:
         """
         Belirli bir zamandaki kareyi döner
@@ -132,6 +272,10 @@ class FrameExtractor:
             self.cap.release()
             self.cap = None
     
+    def close(self):
+        """Video dosyasını kapatır"""
+        self._cleanup()
+    
     def __del__(self):
         """Destructor - kaynakları otomatik temizle"""
         self._cleanup()
@@ -17,26 +17,54 @@ def to_mmss(ts: float) -> str:
     ss = int(ts) % 60          # saniyeyi “aşağı yuvarlar” (00:56 gibi)
     return f"{mm:02d}:{ss:02d}"
 
+INSERT_SQL = (
+    "INSERT INTO ocr_texts_simple "
+    "(file_name, text, topic, duration_sec, confidence) "
+    "VALUES (%s,%s,%s,%s,%s)"
+)
+
+def make_row(file_name: str, text: str, ts_sec: float,
+             confidence: float | None, topic: str | None = None):
+    """insert_detections için satır üretir; boş metinde None döner"""
+    if not text or text.strip() == "":
+        return None
+    return (file_name, text.strip(), topic, to_mmss(ts_sec),
+            None if confidence is None else float(confidence))
+
 class SimpleRowWriter:
     def __init__(self):
         self.pool = pooling.MySQLConnectionPool(pool_name="vp_pool", pool_size=3, **DB_CFG)
+        self._cnx = None  # toplu yazım için uzun ömürlü bağlantı
 
     def _conn(self):
         return self.pool.get_connection()
 
     def insert_detection(self, file_name: str, text: str, ts_sec: float,
                          confidence: float | None, topic: str | None = None):
-        if not text or text.strip() == "":
+        row = make_row(file_name, text, ts_sec, confidence, topic)
+        if row is None:
             return
-        mmss = to_mmss(ts_sec)
         with self._conn() as cnx, cnx.cursor() as cur:
-            cur.execute(
-                "INSERT INTO ocr_texts_simple "
-                "(file_name, text, topic, duration_sec, confidence) "
-                "VALUES (%s,%s,%s,%s,%s)",
-                (file_name, text.strip(), topic, mmss,
-                 None if confidence is None else float(confidence))
-            )
+            cur.execute(INSERT_SQL, row)
             cnx.commit()
 
+    def insert_detections(self, rows: list[tuple]):
+        """
+        Satırları tek executemany + tek commit ile yazar.
+        Aynı bağlantı tekrar kullanılır; tek bir yazıcı thread'inden çağrılmalı.
+        """
+        if not rows:
+            return
+        if self._cnx is None or not self._cnx.is_connected():
+            self._cnx = self._conn()
+        with self._cnx.cursor() as cur:
+            cur.executemany(INSERT_SQL, rows)
+        self._cnx.commit()
+
+    def close(self):
+        """Toplu yazım bağlantısını havuza iade eder"""
+        if self._cnx is not None:
+            self._cnx.close()
+            self._cnx = None
+
             #TRUNCATE TABLE videotext.ocr_texts_simple;
@@ -7,11 +7,118 @@ yapılandırılmış JSON formatında kaydeder.
 
 import json
 import os
+import numpy as np
 from typing import List, Dict, Any, Tuple
 from datetime import datetime
 
+try:
+    # Rust implementasyonu, stdlib json'dan çok daha hızlı serileştirir
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # C++ implementasyonu, SequenceMatcher'dan çok daha hızlı
+    from rapidfuzz.fuzz import ratio as _fuzz_ratio
+except ImportError:
+    _fuzz_ratio = None
+
 OUTPUT_DIR = r"C:\Users\ASUS\Desktop\videotext\processor\output"
 
+# Sütun dizilerinin başlangıç kapasitesi (dolunca iki katına çıkar)
+_INITIAL_CAPACITY = 1024
+
+# Sütun adı → dtype (bbox koordinatları ve boyutları tam sayı)
+_COLUMNS = {
+    "ts": np.float64,
+    "x1": np.int32, "y1": np.int32, "x2": np.int32, "y2": np.int32,
+    "w": np.int32, "h": np.int32,
+    "conf": np.float64,
+    "ids": np.int64,
+}
+
+def _dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Nesneyi UTF-8 JSON baytlarına çevirir (orjson varsa onu kullanır)"""
+    if orjson is not None:
+        opts = orjson.OPT_SERIALIZE_NUMPY
+        if pretty:
+            opts |= orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+        # orjson her zaman UTF-8 bayt üretir (ensure_ascii gerekmez)
+        return orjson.dumps(obj, option=opts)
+    
+    if pretty:
+        text = json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=True)
+    else:
+        text = json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+    return text.encode("utf-8")
+
+
+def _loads(raw: bytes) -> Any:
+    """UTF-8 JSON baytlarını çözer"""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+class _RunningStats:
+    """Tespitleri saklamadan güncellenen istatistikler (stream modu için)"""
+    
+    def __init__(self):
+        self.n = 0
+        self.conf_min = self.conf_max = self.conf_sum = 0.0
+        self.len_min = self.len_max = self.len_sum = 0
+        self.ts_min = self.ts_max = 0.0
+        self.high_confidence = 0
+        self.texts = set()
+    
+    def add(self, d: Dict[str, Any]):
+        conf, length, ts = d["confidence"], d["text_length"], d["timestamp"]
+        if self.n == 0:
+            self.conf_min = self.conf_max = conf
+            self.len_min = self.len_max = length
+            self.ts_min = self.ts_max = ts
+        else:
+            self.conf_min, self.conf_max = min(self.conf_min, conf), max(self.conf_max, conf)
+            self.len_min, self.len_max = min(self.len_min, length), max(self.len_max, length)
+            self.ts_min, self.ts_max = min(self.ts_min, ts), max(self.ts_max, ts)
+        self.n += 1
+        self.conf_sum += conf
+        self.len_sum += length
+        self.high_confidence += conf > 0.8
+        self.texts.add(d["text"])
+    
+    def as_dict(self) -> Dict[str, Any]:
+        if not self.n:
+            return {"message": "Henüz veri yok"}
+        return {
+            "total_detections": self.n,
+            "confidence_stats": {
+                "min": self.conf_min,
+                "max": self.conf_max,
+                "avg": self.conf_sum / self.n
+            },
+            "text_length_stats": {
+                "min": self.len_min,
+                "max": self.len_max,
+                "avg": self.len_sum / self.n
+            },
+            "time_range": {
+                "start": self.ts_min,
+                "end": self.ts_max,
+                "duration": self.ts_max - self.ts_min
+            },
+            "high_confidence_count": self.high_confidence,
+            "unique_texts": len(self.texts)
+        }
+
+
+def _similarity(a: str, b: str) -> float:
+    """İki metnin benzerlik oranını (0.0-1.0) döner"""
+    if _fuzz_ratio is not None:
+        return _fuzz_ratio(a, b) / 100.0
+    
+    from difflib import SequenceMatcher
+    return SequenceMatcher(None, a, b).ratio()
+
+
 class JsonWriter:
     """
     OCR sonuçlarını JSON formatında kaydeder
@@ -20,16 +127,19 @@ class JsonWriter:
     - UTF-8 desteği (Türkçe karakterler)
     - Yapılandırılmış veri formatı
     - Metadata bilgileri
-    - Performans optimizasyonu
+    - Performans optimizasyonu (tespitler NumPy sütunlarında tutulur)
+    - Stream modu: tespitler bellekte tutulmadan JSON-Lines'a yazılır
     """
     
-    def __init__(self, output_path: str):
+    def __init__(self, output_path: str, stream: bool = False):
         """
         Args:
             output_path (str): Çıktı JSON dosyası yolu
+            stream (bool): Tespitleri bellekte tutmak yerine diske akıt
+                (uzun videolarda bellek kullanımı sabit kalır)
         """
         self.output_path = output_path
-        self.data: List[Dict[str, Any]] = []
+        self.stream = stream
         self.metadata = {
             "created_at": datetime.now().isoformat(),
             "total_detections": 0,
@@ -38,6 +148,20 @@ class JsonWriter:
         
         # Çıktı dizinini oluştur
         os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        
+        # Bellek modunda tespitler sütun bazlı (SoA) tutulur:
+        # her alan ayrı bir NumPy dizisi, metinler ayrı bir listede
+        self._n = 0
+        self._cols = {name: np.empty(_INITIAL_CAPACITY, dtype)
+                      for name, dtype in _COLUMNS.items()}
+        self._texts: List[str] = []
+        
+        # Stream modunda tespitler satır satır .jsonl yan dosyasına yazılır
+        self._stats = _RunningStats()
+        self._jsonl = None
+        if stream:
+            self.stream_path = os.path.splitext(output_path)[0] + ".jsonl"
+            self._jsonl = open(self.stream_path, "wb", buffering=1 << 20)
     
     def add(self, timestamp: float, bbox: Tuple[float, float, float, float], 
             text: str, confidence: float):
@@ -51,25 +175,101 @@ class JsonWriter:
             confidence (float): Güven skoru (0.0-1.0)
         """
         x1, y1, x2, y2 = bbox
+        detection_id = self.metadata["total_detections"] + 1
         
-        detection = {
-            "timestamp": round(timestamp, 3),
+        if self.stream:
+            detection = {
+                "timestamp": round(timestamp, 3),
+                "bbox": {
+                    "x1": int(x1),
+                    "y1": int(y1),
+                    "x2": int(x2),
+                    "y2": int(y2),
+                    "width": int(x2 - x1),
+                    "height": int(y2 - y1)
+                },
+                "text": text.strip(),
+                "confidence": round(confidence, 4),
+                "text_length": len(text.strip()),
+                "detection_id": detection_id
+            }
+            self._jsonl.write(_dumps(detection) + b"\n")
+            self._stats.add(detection)
+        else:
+            if self._n == len(self._cols["ts"]):
+                self._grow()
+            i, c = self._n, self._cols
+            c["ts"][i] = round(timestamp, 3)
+            c["x1"][i], c["y1"][i] = int(x1), int(y1)
+            c["x2"][i], c["y2"][i] = int(x2), int(y2)
+            c["w"][i], c["h"][i] = int(x2 - x1), int(y2 - y1)
+            c["conf"][i] = round(confidence, 4)
+            c["ids"][i] = detection_id
+            self._texts.append(text.strip())
+            self._n += 1
+        self.metadata["total_detections"] += 1
+    
+    def _grow(self):
+        """Sütun dizilerinin kapasitesini iki katına çıkarır"""
+        for name, col in self._cols.items():
+            grown = np.empty(len(col) * 2, col.dtype)
+            grown[:self._n] = col[:self._n]
+            self._cols[name] = grown
+    
+    def _col(self, name: str) -> np.ndarray:
+        """Sütunun dolu kısmını (görünüm) döner"""
+        return self._cols[name][:self._n]
+    
+    def _take(self, indices):
+        """Sadece verilen sıralardaki tespitleri tutar"""
+        indices = np.asarray(indices, dtype=np.intp)
+        for name, col in self._cols.items():
+            kept = col[:self._n][indices]
+            self._cols[name] = np.empty(max(len(kept), _INITIAL_CAPACITY), col.dtype)
+            self._cols[name][:len(kept)] = kept
+        self._texts = [self._texts[i] for i in indices]
+        self._n = len(indices)
+    
+    def _row(self, i: int) -> Dict[str, Any]:
+        """i. tespiti JSON çıktısındaki sözlük biçiminde döner"""
+        c = self._cols
+        text = self._texts[i]
+        return {
+            "timestamp": float(c["ts"][i]),
             "bbox": {
-                "x1": int(x1),
-                "y1": int(y1),
-                "x2": int(x2),
-                "y2": int(y2),
-                "width": int(x2 - x1),
-                "height": int(y2 - y1)
+                "x1": int(c["x1"][i]),
+                "y1": int(c["y1"][i]),
+                "x2": int(c["x2"][i]),
+                "y2": int(c["y2"][i]),
+                "width": int(c["w"][i]),
+                "height": int(c["h"][i])
             },
-            "text": text.strip(),
-            "confidence": round(confidence, 4),
-            "text_length": len(text.strip()),
-            "detection_id": len(self.data) + 1
+            "text": text,
+            "confidence": float(c["conf"][i]),
+            "text_length": len(text),
+            "detection_id": int(c["ids"][i])
         }
-        
-        self.data.append(detection)
-        self.metadata["total_detections"] += 1
+    
+    @property
+    def data(self) -> List[Dict[str, Any]]:
+        """Tespitlerin sözlük listesi (her erişimde sütunlardan üretilir)"""
+        return list(self._iter_detections())
+    
+    @data.setter
+    def data(self, detections: List[Dict[str, Any]]):
+        self._n = 0
+        self._texts = []
+        for name, dtype in _COLUMNS.items():
+            self._cols[name] = np.empty(max(len(detections), _INITIAL_CAPACITY), dtype)
+        for d in detections:
+            i, c, b = self._n, self._cols, d["bbox"]
+            c["ts"][i] = d["timestamp"]
+            c["x1"][i], c["y1"][i], c["x2"][i], c["y2"][i] = b["x1"], b["y1"], b["x2"], b["y2"]
+            c["w"][i], c["h"][i] = b["width"], b["height"]
+            c["conf"][i] = d["confidence"]
+            c["ids"][i] = d["detection_id"]
+            self._texts.append(d["text"])
+            self._n += 1
     
     def add_metadata(self, key: str, value: Any):
         """
@@ -88,32 +288,37 @@ class JsonWriter:
         Returns:
             dict: İstatistik bilgileri
         """
-        if not self.data:
+        if self.stream:
+            return self._stats.as_dict()
+        
+        if not self._n:
             return {"message": "Henüz veri yok"}
         
-        confidences = [d["confidence"] for d in self.data]
-        text_lengths = [d["text_length"] for d in self.data]
-        timestamps = [d["timestamp"] for d in self.data]
+        n = self._n
+        confs = self._col("conf")
+        ts = self._col("ts")
+        lens = np.fromiter(map(len, self._texts), dtype=np.int64, count=n)
         
+        # NumPy skalerleri JSON'a yazılamaz → Python tiplerine çevir
         stats = {
-            "total_detections": len(self.data),
+            "total_detections": n,
             "confidence_stats": {
-                "min": min(confidences),
-                "max": max(confidences),
-                "avg": sum(confidences) / len(confidences)
+                "min": float(confs.min()),
+                "max": float(confs.max()),
+                "avg": float(confs.mean())
             },
             "text_length_stats": {
-                "min": min(text_lengths),
-                "max": max(text_lengths),
-                "avg": sum(text_lengths) / len(text_lengths)
+                "min": int(lens.min()),
+                "max": int(lens.max()),
+                "avg": float(lens.mean())
             },
             "time_range": {
-                "start": min(timestamps),
-                "end": max(timestamps),
-                "duration": max(timestamps) - min(timestamps)
+                "start": float(ts.min()),
+                "end": float(ts.max()),
+                "duration": float(ts.max() - ts.min())
             },
-            "high_confidence_count": len([c for c in confidences if c > 0.8]),
-            "unique_texts": len(set(d["text"] for d in self.data))
+            "high_confidence_count": int((confs > 0.8).sum()),
+            "unique_texts": len(set(self._texts))
         }
         
         return stats
@@ -125,13 +330,18 @@ class JsonWriter:
         Args:
             min_confidence (float): Minimum güven skoru
         """
-        original_count = len(self.data)
-        self.data = [d for d in self.data if d["confidence"] >= min_confidence]
-        filtered_count = original_count - len(self.data)
+        original_count = self.metadata["total_detections"]
+        if self.stream:
+            kept_count = self._rewrite_stream(
+                d for d in self._iter_detections() if d["confidence"] >= min_confidence)
+        else:
+            self._take(np.flatnonzero(self._col("conf") >= min_confidence))
+            kept_count = self._n
+        filtered_count = original_count - kept_count
         
         if filtered_count > 0:
             print(f"🔍 {filtered_count} düşük güvenli sonuç filtrelendi")
-            self.metadata["total_detections"] = len(self.data)
+            self.metadata["total_detections"] = kept_count
     
     def remove_duplicates(self, time_threshold: float = 1.0, similarity_threshold: float = 0.9):
         """
@@ -141,44 +351,74 @@ class JsonWriter:
             time_threshold (float): Zaman eşiği (saniye)
             similarity_threshold (float): Benzerlik eşiği
         """
-        if len(self.data) <= 1:
+        if self.metadata["total_detections"] <= 1:
             return
         
-        from difflib import SequenceMatcher
+        # Karşılaştırma sütunlar üzerinden yapılır; stream modunda
+        # tespitler geçici olarak yüklenir
+        if self.stream:
+            data = list(self._iter_detections())
+            timestamps = [d["timestamp"] for d in data]
+            texts = [d["text"] for d in data]
+            confidences = [d["confidence"] for d in data]
+        else:
+            timestamps = self._col("ts").tolist()
+            texts = self._texts
+            confidences = self._col("conf").tolist()
+        
+        # Sadece zaman penceresine düşebilecek kayıtlarla karşılaştırmak için
+        # tespitleri time_threshold genişliğinde kovalara ayır
+        def _bucket(ts):
+            return int(ts // time_threshold) if time_threshold > 0 else ts
         
-        filtered_data = []
+        kept: Dict[int, int] = {}              # sıra → tespit indeksi
+        buckets: Dict[Any, List[int]] = {}     # kova → sıralar
+        lowered = [t.lower() for t in texts]
+        seq = 0
         
-        for current in self.data:
+        for cur, cur_ts in enumerate(timestamps):
+            bucket = _bucket(cur_ts)
+            near = [bucket - 1, bucket, bucket + 1] if time_threshold > 0 else [bucket]
+            candidates = sorted(i for b in near for i in buckets.get(b, ()))
             is_duplicate = False
             
-            for existing in filtered_data:
+            for i in candidates:
+                existing = kept[i]
                 # Zaman farkı kontrolü
-                time_diff = abs(current["timestamp"] - existing["timestamp"])
+                time_diff = abs(cur_ts - timestamps[existing])
                 if time_diff > time_threshold:
                     continue
                 
                 # Metin benzerlik kontrolü
-                similarity = SequenceMatcher(None, 
-                                           current["text"].lower(), 
-                                           existing["text"].lower()).ratio()
+                similarity = _similarity(lowered[cur], lowered[existing])
                 
                 if similarity >= similarity_threshold:
                     is_duplicate = True
                     # Daha yüksek güven skorlu olanı tut
-                    if current["confidence"] > existing["confidence"]:
-                        filtered_data.remove(existing)
-                        filtered_data.append(current)
+                    if confidences[cur] > confidences[existing]:
+                        del kept[i]
+                        buckets[_bucket(timestamps[existing])].remove(i)
+                        kept[seq] = cur
+                        buckets.setdefault(bucket, []).append(seq)
+                        seq += 1
                     break
             
             if not is_duplicate:
-                filtered_data.append(current)
+                kept[seq] = cur
+                buckets.setdefault(bucket, []).append(seq)
+                seq += 1
+        
+        order = [kept[i] for i in sorted(kept)]
         
-        removed_count = len(self.data) - len(filtered_data)
-        self.data = filtered_data
+        removed_count = len(timestamps) - len(order)
+        if self.stream:
+            self._rewrite_stream(data[j] for j in order)
+        else:
+            self._take(order)
         
         if removed_count > 0:
             print(f"🧹 {removed_count} tekrar eden sonuç temizlendi")
-            self.metadata["total_detections"] = len(self.data)
+            self.metadata["total_detections"] = len(order)
     
     def finalize(self, include_stats: bool = True, pretty_print: bool = True):
         """
@@ -195,28 +435,81 @@ class JsonWriter:
         self.metadata["completed_at"] = datetime.now().isoformat()
         self.metadata["output_file"] = os.path.abspath(self.output_path)
         
-        # JSON yapısı
-        output_data = {
-            "metadata": self.metadata,
-            "detections": self.data
-        }
-        
         # Dosyayı yaz
-        with open(self.output_path, "w", encoding="utf-8") as f:
-            if pretty_print:
-                json.dump(output_data, f, ensure_ascii=False, indent=2, sort_keys=True)
-            else:
-                json.dump(output_data, f, ensure_ascii=False, separators=(',', ':'))
+        if self.stream:
+            self._finalize_stream(pretty_print)
+        else:
+            # JSON yapısı
+            output_data = {
+                "metadata": self.metadata,
+                "detections": self.data
+            }
+            with open(self.output_path, "wb") as f:
+                f.write(_dumps(output_data, pretty=pretty_print))
         
         print(f"💾 JSON dosyası kaydedildi: {self.output_path}")
         
         # Özet bilgi göster
-        if self.data:
+        if self.metadata["total_detections"]:
             stats = self.get_statistics()
             print(f"📊 Toplam tespit: {stats['total_detections']}")
             print(f"⏱️  Zaman aralığı: {stats['time_range']['duration']:.2f}s")
             print(f"🎯 Ortalama güven: {stats['confidence_stats']['avg']:.3f}")
 
+    def _finalize_stream(self, pretty_print: bool):
+        """
+        .jsonl satırlarını belleğe almadan son JSON dosyasına birleştirir
+        
+        Anahtar sırası sort_keys çıktısıyla aynıdır (detections, metadata);
+        her tespit tek satırda kalır. .jsonl yan dosyası korunur.
+        """
+        self.close()
+        with open(self.output_path, "wb") as out, open(self.stream_path, "rb") as src:
+            out.write(b'{"detections": [\n')
+            for i, line in enumerate(src):
+                if i:
+                    out.write(b",\n")
+                out.write(line.rstrip(b"\n"))
+            out.write(b'\n], "metadata": ')
+            out.write(_dumps(self.metadata, pretty=pretty_print))
+            out.write(b"}\n")
+    
+    def _iter_detections(self):
+        """Tespitleri sırayla döner (stream modunda diskten okur)"""
+        if not self.stream:
+            for i in range(self._n):
+                yield self._row(i)
+            return
+        
+        if self._jsonl is not None:
+            self._jsonl.flush()
+        with open(self.stream_path, "rb") as f:
+            for line in f:
+                yield _loads(line)
+    
+    def _rewrite_stream(self, detections) -> int:
+        """.jsonl dosyasını verilen tespitlerle yeniden yazar, istatistikleri tazeler"""
+        was_open = self._jsonl is not None
+        self.close()
+        
+        tmp_path = self.stream_path + ".tmp"
+        self._stats = _RunningStats()
+        with open(tmp_path, "wb", buffering=1 << 20) as f:
+            for d in detections:
+                f.write(_dumps(d) + b"\n")
+                self._stats.add(d)
+        os.replace(tmp_path, self.stream_path)
+        
+        if was_open:
+            self._jsonl = open(self.stream_path, "ab", buffering=1 << 20)
+        return self._stats.n
+    
+    def close(self):
+        """Stream modunda .jsonl dosyasını kapatır"""
+        if self._jsonl is not None:
+            self._jsonl.close()
+            self._jsonl = None
+
     def _format_mmss(self, seconds: float, show_ms: bool = False) -> str:
         """Saniyeyi [MM:SS] formatına çevirir."""
         if seconds is None:
@@ -243,22 +536,20 @@ class JsonWriter:
 
         os.makedirs(os.path.dirname(text_file_path), exist_ok=True)
 
-        from collections import OrderedDict
-        buckets: "OrderedDict[float, list[str]]" = OrderedDict()
+        from collections import defaultdict
+        # Zaman damgaları add() içinde 3 haneye yuvarlandığı için güvenli anahtar
+        buckets: "defaultdict[float, list[str]]" = defaultdict(list)
 
-        for d in sorted(self.data, key=lambda x: x["timestamp"]):
-            ts = d["timestamp"]
+        for d in self._iter_detections():
             txt = d["text"].strip()
-            if not txt:
-                continue
-            if ts not in buckets:
-                buckets[ts] = []
-            buckets[ts].append(txt)
+            if txt:
+                buckets[d["timestamp"]].append(txt)
 
+        # Tüm tespitler yerine sadece farklı zaman damgaları sıralanır
         with open(text_file_path, "w", encoding="utf-8") as f:
-            for ts, texts in buckets.items():
+            for ts in sorted(buckets):
                 stamp = self._format_mmss(ts, show_ms=show_ms)
-                line = f"{stamp} - {sep.join(texts)}"
+                line = f"{stamp} - {sep.join(buckets[ts])}"
                 f.write(line + "\n")
 
         print(f"📄 Kare bazlı metin dosyası: {text_file_path}")
@@ -276,7 +567,7 @@ class JsonWriter:
             text_file_path = self.output_path.replace('.json', '_texts.txt')
         
         with open(text_file_path, "w", encoding="utf-8") as f:
-            for detection in sorted(self.data, key=lambda x: x["timestamp"]):
+            for detection in sorted(self._iter_detections(), key=lambda x: x["timestamp"]):
                 timestamp = detection["timestamp"]
                 text = detection["text"]
                 confidence = detection["confidence"]
@@ -0,0 +1,61 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, initializedcheck=False
+"""
+Poligon → bbox ve skor filtresi için derlenmiş eklenti (opsiyonel)
+
+Derleme (ocr/ dizininde):
+    cythonize -3 --inplace _bbox_ext.pyx
+
+Derlenmemişse paddle.py aynı sonucu veren NumPy sürümünü kullanır.
+"""
+
+import numpy as np
+
+
+cpdef tuple bboxes_from_polys(const double[:, :, :] polys, const double[:] scores,
+                              list texts, double thresh):
+    """
+    Skor eşiğini geçen ve metni boş olmayan kutuların bbox'larını hesaplar
+
+    Args:
+        polys: (N, köşe, 2) köşe koordinatları
+        scores: (N,) tanıma skorları
+        texts: N metin
+        thresh: En düşük skor
+
+    Returns:
+        tuple: ((M, 4) x1, y1, x2, y2 dizisi, (M,) tutulan kutu indeksleri)
+    """
+    cdef Py_ssize_t n = polys.shape[0]
+    cdef Py_ssize_t corners = polys.shape[1]
+    cdef Py_ssize_t i, j, m = 0
+    cdef double x, y, x1, y1, x2, y2
+
+    out = np.empty((n, 4), dtype=np.float64)
+    kept = np.empty(n, dtype=np.intp)
+    cdef double[:, ::1] boxes = out
+    cdef Py_ssize_t[::1] idx = kept
+
+    for i in range(n):
+        if scores[i] < thresh or not texts[i] or corners == 0:
+            continue
+        x1 = x2 = polys[i, 0, 0]
+        y1 = y2 = polys[i, 0, 1]
+        for j in range(1, corners):
+            x = polys[i, j, 0]
+            y = polys[i, j, 1]
+            if x < x1:
+                x1 = x
+            elif x > x2:
+                x2 = x
+            if y < y1:
+                y1 = y
+            elif y > y2:
+                y2 = y
+        boxes[m, 0] = x1
+        boxes[m, 1] = y1
+        boxes[m, 2] = x2
+        boxes[m, 3] = y2
+        idx[m] = i
+        m += 1
+
+    return out[:m], kept[:m]
@@ -6,7 +6,7 @@ Bu sayede farklı OCR teknolojileri aynı şekilde kullanılabilir.
 """
 
 from abc import ABC, abstractmethod
-from typing import Iterator, Tuple
+from typing import Iterator, List, Tuple
 import numpy as np
 
 
@@ -34,6 +34,21 @@ class BaseOCR(ABC):
         """
         pass
     
+    def recognize_batch(self, frames: List[np.ndarray]) -> List[List[Tuple[Tuple[float, float, float, float], str, float]]]:
+        """
+        Birden fazla kareden metin tanıma işlemi
+
+        Varsayılan implementasyon her kare için recognize çağırır.
+        Toplu çıkarım destekleyen motorlar bu metodu override etmelidir.
+
+        Args:
+            frames (list): İşlenecek görüntü kareleri
+
+        Returns:
+            list: Her kare için (bbox, text, confidence) listesi (giriş sırasıyla)
+        """
+        return [list(self.recognize(frame)) for frame in frames]
+    
     @abstractmethod
     def set_language(self, language: str):
         """
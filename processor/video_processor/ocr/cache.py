@@ -0,0 +1,223 @@
+"""
+OCR Sonuç Önbelleği - Neredeyse aynı kareler için OCR tekrarını önler
+
+Kareler küçük bir algısal hash (dHash) ile anahtarlanır. Aynı altyazının
+kaldığı ya da yavaş değişen sahnelerde OCR yeniden çalıştırılmaz,
+önceki sonuç kullanılır.
+
+8x8 dHash küçük metin değişikliklerini (ör. altyazının değişmesi) ayırt
+edemez; bu yüzden hash eşleşmesi, karelerin 480x270 gri önizlemeleri
+karşılaştırılarak doğrulanır.
+"""
+
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+import cv2
+import numpy as np
+
+try:
+    # Opsiyonel: hash bitlerini ve popcount döngüsünü makine koduna derler
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Hash'lerin "aynı kare" sayılması için izin verilen en fazla farklı bit
+HASH_TOLERANCE = 4
+
+# Önbellekte tutulacak en fazla sonuç sayısı
+CACHE_SIZE = 256
+
+# Doğrulama önizlemesinin boyutu (genişlik, yükseklik). 1080p'de ~15 px'lik
+# metin değişiklikleri ("10:15" → "10:16", "ABC" → "ABD") 160x90'da gürültü
+# düzeyinde (≤5) kalır; 480x270'te 30-45 gri seviyesi fark eder.
+THUMB_SIZE = (480, 270)
+
+# Önizlemelerde izin verilen en büyük piksel farkı (JPEG/sensör gürültüsü ≤4)
+THUMB_TOLERANCE = 12
+
+# Boş kare kontrolünün yapıldığı önizleme boyutu (BLANK_EDGE bu boyuta göre ayarlı)
+BLANK_SIZE = (160, 90)
+
+# Önizlemede hiçbir pikselin Laplacian yanıtı bunu geçmiyorsa kare boş sayılır
+# (OCR atlanır). Sıkıştırma gürültüsü/film greni ~26'yı, 160x90'a küçülen en
+# kısa altyazılar bile ~150'yi (%15 parlaklığa sönmüş metin ~48'i) geçer.
+BLANK_EDGE = 32
+
+
+def thumbnail(frame: np.ndarray) -> np.ndarray:
+    """Karenin küçük gri önizlemesini döner (hash ve doğrulama için)"""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    return cv2.resize(gray, THUMB_SIZE, interpolation=cv2.INTER_AREA)
+
+
+def frame_signature(frame: np.ndarray) -> Tuple[int, np.ndarray]:
+    """Karenin (dHash, önizleme) imzasını döner"""
+    thumb = thumbnail(frame)
+    return dhash(thumb), thumb
+
+
+def same_frame(a: np.ndarray, b: np.ndarray, tolerance: int = THUMB_TOLERANCE) -> bool:
+    """İki önizlemenin (gürültü payı içinde) aynı kare olup olmadığını döner"""
+    return a.shape == b.shape and int(cv2.absdiff(a, b).max()) <= tolerance
+
+
+def is_blank(thumb: np.ndarray, threshold: int = BLANK_EDGE) -> bool:
+    """
+    Önizlemenin boş/neredeyse boş (düz renk, kararma, geçiş) olup olmadığını döner
+
+    Tüm karenin varyansı yerine en güçlü yerel kenar kullanılır: kısa bir
+    altyazı ("Evet") karenin çok küçük bir kısmını kapladığı için varyansı
+    düşük kalır, ama harf kenarları tek başına eşiği rahatça aşar.
+    """
+    if thumb.shape[:2] != BLANK_SIZE[::-1]:
+        thumb = cv2.resize(thumb, BLANK_SIZE, interpolation=cv2.INTER_AREA)
+    _, max_edge, _, _ = cv2.minMaxLoc(cv2.convertScaleAbs(cv2.Laplacian(thumb, cv2.CV_16S)))
+    return max_edge < threshold
+
+
+def dhash(frame: np.ndarray) -> int:
+    """
+    Karenin 64 bitlik fark hash'ini (dHash) hesaplar
+
+    Kare 9x8 griye küçültülür ve her satırda komşu pikseller
+    karşılaştırılarak 64 bit üretilir.
+
+    Args:
+        frame (np.ndarray): BGR ya da gri görüntü
+
+    Returns:
+        int: 64 bitlik hash
+    """
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    if njit is not None:
+        return int(_dhash_u64(small))
+    bits = small[:, 1:] > small[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming(a: int, b: int) -> int:
+    """İki hash arasındaki farklı bit sayısını döner"""
+    return (a ^ b).bit_count()
+
+
+def hamming_table(key: int, table: np.ndarray) -> np.ndarray:
+    """
+    Bir hash'in uint64 hash dizisindeki her elemana Hamming mesafesini döner
+
+    Args:
+        key (int): Aranan hash
+        table (np.ndarray): uint64 hash dizisi
+
+    Returns:
+        np.ndarray: Her eleman için farklı bit sayısı
+    """
+    if njit is not None:
+        return _hamming_table(np.uint64(key), table)
+    xor = np.bitwise_xor(table, np.uint64(key))
+    return np.unpackbits(xor.view(np.uint8)).reshape(-1, 64).sum(axis=1)
+
+
+if njit is not None:
+    @njit(cache=True, nogil=True)
+    def _dhash_u64(small):
+        """9x8 gri görüntüden 64 bitlik dHash (packbits ile aynı bit sırası)"""
+        h = np.uint64(0)
+        one = np.uint64(1)
+        for y in range(8):
+            for x in range(8):
+                h = h << one
+                if small[y, x + 1] > small[y, x]:
+                    h = h | one
+        return h
+
+    @njit(cache=True, nogil=True)
+    def _hamming_table(key, table):
+        """xor + popcount döngüsü (SWAR bit sayımı)"""
+        out = np.empty(table.shape[0], np.int64)
+        m1 = np.uint64(0x5555555555555555)
+        m2 = np.uint64(0x3333333333333333)
+        m4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+        h01 = np.uint64(0x0101010101010101)
+        for i in range(table.shape[0]):
+            x = table[i] ^ key
+            x = x - ((x >> np.uint64(1)) & m1)
+            x = (x & m2) + ((x >> np.uint64(2)) & m2)
+            x = (x + (x >> np.uint64(4))) & m4
+            out[i] = (x * h01) >> np.uint64(56)
+        return out
+
+
+class OCRResultCache:
+    """
+    dHash → OCR sonucu eşlemesi tutan küçük LRU önbellek
+
+    Özellikler:
+    - Hamming mesafesi toleransı ile yakın eşleşme
+    - Eşleşmelerin önizleme ile doğrulanması
+    - En eski sonuçları otomatik atma
+    """
+
+    def __init__(self, max_size: int = CACHE_SIZE, tolerance: int = HASH_TOLERANCE):
+        """
+        Args:
+            max_size (int): Tutulacak en fazla sonuç sayısı
+            tolerance (int): Yakın eşleşme için en fazla farklı bit
+        """
+        self.max_size = max(1, max_size)
+        self.tolerance = tolerance
+        self._entries: "OrderedDict[int, Tuple[np.ndarray, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: int, thumb: np.ndarray) -> Optional[Any]:
+        """
+        Kareye karşılık gelen sonucu döner (yoksa None)
+
+        Args:
+            key (int): Karenin dHash değeri
+            thumb (np.ndarray): Karenin önizlemesi (bkz. frame_signature)
+        """
+        match = self._find(key, thumb)
+        if match is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(match)
+        self.hits += 1
+        return self._entries[match][1]
+
+    def put(self, key: int, thumb: np.ndarray, results: Any):
+        """
+        Sonucu önbelleğe ekler
+
+        Args:
+            key (int): Karenin dHash değeri
+            thumb (np.ndarray): Karenin önizlemesi
+            results: OCR sonuçları
+        """
+        self._entries[key] = (thumb, results)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _find(self, key: int, thumb: np.ndarray) -> Optional[int]:
+        """Tolerans içinde ve önizlemesi tutan hash'i bulur (en yeniden başlayarak)"""
+        entry = self._entries.get(key)
+        if entry is not None and same_frame(entry[0], thumb):
+            return key
+        if self.tolerance <= 0 or not self._entries:
+            return None
+
+        # Tüm hash'lere mesafe tek vektörel çağrıda (en yeniden başlayarak)
+        keys = list(reversed(self._entries))
+        dists = hamming_table(key, np.array(keys, dtype=np.uint64))
+        for i in np.flatnonzero(dists <= self.tolerance):
+            other = keys[i]
+            if other != key and same_frame(self._entries[other][0], thumb):
+                return other
+        return None
+
+    def __len__(self) -> int:
+        return len(self._entries)
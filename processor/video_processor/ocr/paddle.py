@@ -5,14 +5,200 @@ PaddleOCR 3.x'in yeni API'sini kullanır.
 Türkçe dil desteği ve GPU/CPU optimizasyonu içerir.
 """
 
+import concurrent.futures
+import functools
+import importlib.util
+import logging
+import operator
+import os
+import queue
+import threading
+import time
+
 import numpy as np
-from typing import Iterator, Tuple, List
+from typing import Iterable, Iterator, Tuple, List, Optional
 import cv2
 
 from .base import BaseOCR
+from .cache import OCRResultCache, frame_signature, hamming, same_frame
 # a) en üst kısma ekle
 # from .beton import BetonPreprocessor, OtsuConfig
 
+try:
+    # Opsiyonel: derlenmiş poly → bbox eklentisi (bkz. _bbox_ext.pyx)
+    from ._bbox_ext import bboxes_from_polys
+except ImportError:
+    bboxes_from_polys = None
+
+logger = logging.getLogger(__name__)
+
+# Kullanılan modeller: PaddleOCR 3.1.0'ın lang="tr" için seçtikleri. Açıkça
+# verilir ki açı düzeltmedeki yeniden tanıma da aynı (Latin) modeli kullansın.
+DET_MODEL = "PP-OCRv5_server_det"
+REC_MODEL = "latin_PP-OCRv5_mobile_rec"
+
+# Bu skorun altındaki tanımalar (açı düzeltmeden sonra) atılır
+MIN_SCORE = 0.30
+
+# OCR'a verilecek en büyük kare boyutu (genişlik, yükseklik); büyükler küçültülür
+MAX_INPUT_SIZE = (1920, 1080)
+
+# Bu en-boy oranının (yükseklik/genişlik) üstündeki ya da bu skorun altındaki
+# satırlar açı sınıflandırıcısından geçirilir (bkz. _fix_orientation)
+ORIENT_ASPECT = 1.5
+ORIENT_SCORE = 0.6
+
+# Kare önbelleğinde (bkz. frame_cache) tutulacak sonuç sayısı
+FRAME_CACHE_SIZE = 128
+
+# Predict sayfasından tek seferde okunan alanlar. rec_polys tanınan (skor
+# eşiğini geçen) metinlerle hizalıdır; dt_polys ise tüm tespitleri içerir ve
+# sadece rec_polys olmayan sürümlerde kullanılır.
+_PAGE_FIELDS = operator.itemgetter("rec_polys", "rec_texts", "rec_scores")
+_LEGACY_PAGE_FIELDS = operator.itemgetter("dt_polys", "rec_texts", "rec_scores")
+
+# recognize_batch'te kareleri paralel ön-işleyen en fazla thread (cv2.resize GIL'i bırakır)
+PREPROCESS_WORKERS = 4
+
+# start_pipeline aşamaları arasındaki kuyruk boyutu
+PIPELINE_QUEUE_SIZE = 2
+
+# Pipeline kuyruklarında akış sonunu bildiren işaret
+_EOF = None
+
+# Büyütülen küçük karelere uygulanan unsharp mask (bulanıklık sigması, miktar)
+UNSHARP_SIGMA = 1.0
+UNSHARP_AMOUNT = 0.5
+
+# _plan_resize işlem kodları
+RESIZE_NONE = 0
+RESIZE_UP = 1    # INTER_LINEAR + keskinleştirme
+RESIZE_DOWN = 2  # INTER_AREA
+
+
+def _page_fields(page) -> Optional[tuple]:
+    """Sayfanın (dt_polys, rec_texts, rec_scores) alanlarını döner (boş sayfada None)"""
+    res = page["res"] if "res" in page else page
+    try:
+        return _PAGE_FIELDS(res) if "rec_polys" in res else _LEGACY_PAGE_FIELDS(res)
+    except KeyError:
+        # Boş sayfa (predict hatası ya da eksik sonuç)
+        return None
+
+
+def _bboxes_from_polys_np(corners: np.ndarray, scores: np.ndarray, texts: list,
+                         thresh: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Skor eşiğini geçen ve metni boş olmayan kutuların bbox'larını hesaplar
+
+    Returns:
+        tuple: ((M, 4) x1, y1, x2, y2 dizisi, (M,) tutulan kutu indeksleri)
+    """
+    kept = np.flatnonzero(scores >= thresh)
+    kept = kept[np.array([bool(texts[i]) for i in kept], dtype=bool)]
+    boxes = np.concatenate([corners[kept].min(axis=1), corners[kept].max(axis=1)], axis=1)
+    return boxes, kept
+
+
+def _bboxes_from_ragged(polys: list, scores: np.ndarray, texts: list,
+                        thresh: float) -> Tuple[np.ndarray, np.ndarray]:
+    """_bboxes_from_polys'un köşe sayıları farklı kutular için kutu kutu sürümü"""
+    kept = [i for i in np.flatnonzero(scores >= thresh).tolist() if texts[i]]
+    boxes = np.empty((len(kept), 4), dtype=np.float64)
+    for row, i in enumerate(kept):
+        arr = np.asarray(polys[i], dtype=np.float64).reshape(-1, 2)
+        boxes[row, :2] = arr.min(axis=0)
+        boxes[row, 2:] = arr.max(axis=0)
+    return boxes, np.asarray(kept, dtype=np.intp)
+
+
+# Derlenmiş eklenti varsa onu, yoksa aynı sonucu veren NumPy sürümünü kullan
+_bboxes_from_polys = bboxes_from_polys if bboxes_from_polys is not None else _bboxes_from_polys_np
+
+
+def _stack_polys(polys) -> Optional[np.ndarray]:
+    """Kutuları (N, köşe, 2) float64 dizisine çevirir (köşe sayıları farklıysa None)"""
+    try:
+        corners = np.asarray(polys, dtype=np.float64)
+    except ValueError:
+        return None
+    return corners if corners.ndim == 3 and corners.shape[2] == 2 else None
+
+
+def _plan_resize(height: int, width: int, max_width: int, max_height: int) -> Tuple[int, int, int]:
+    """
+    Karenin OCR girişi için yeniden boyutlandırma planını döner
+
+    Args:
+        height (int): Kare yüksekliği
+        width (int): Kare genişliği
+        max_width (int): En büyük genişlik
+        max_height (int): En büyük yükseklik
+
+    Returns:
+        tuple: (yeni_genişlik, yeni_yükseklik, RESIZE_NONE/RESIZE_UP/RESIZE_DOWN)
+    """
+    # Çok küçük görüntüler büyütülür (PaddleOCR 3.x için optimize edildi)
+    if height < 32 or width < 32:
+        scale_factor = max(64 / height, 64 / width)
+        return int(width * scale_factor), int(height * scale_factor), RESIZE_UP
+
+    # Çok büyük görüntüler küçültülür (performans ve bellek için)
+    if height > max_height or width > max_width:
+        scale_factor = min(max_height / height, max_width / width)
+        return int(width * scale_factor), int(height * scale_factor), RESIZE_DOWN
+
+    return width, height, RESIZE_NONE
+
+
+
+@functools.lru_cache(maxsize=1)
+def _gpu_available() -> bool:
+    """CUDA'lı paddle ve en az bir GPU olup olmadığını döner (süreç başına bir kez)"""
+    if importlib.util.find_spec("paddle") is None:
+        return False
+    try:
+        import paddle
+        return paddle.device.is_compiled_with_cuda() and paddle.device.cuda.device_count() > 0
+    except Exception:
+        return False
+
+
+# _warn_once ile bir kez yazılmış uyarılar
+_warned = set()
+
+
+def _warn_once(msg: str):
+    """
+    Uyarıyı aynı mesaj için sadece bir kez loglar
+
+    Bozuk bir akışta her karede tekrar eden hata (ör. predict) stderr'i
+    doldurmaz ve iç döngüye yazma maliyeti eklemez.
+    """
+    if msg not in _warned:
+        _warned.add(msg)
+        logger.warning(msg)
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Kuyruğa koyar; pipeline durdurulursa vazgeçip False döner"""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q: queue.Queue, stop: threading.Event):
+    """Kuyruktan alır; pipeline durdurulursa _EOF döner"""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _EOF
 
 
 class PaddleOCRWrapper(BaseOCR):
@@ -26,124 +212,581 @@ class PaddleOCRWrapper(BaseOCR):
     - PP-OCRv5 model desteği
     """
     
-    def __init__(self, gpu: bool = True):
+    def __init__(self, gpu: bool = True, frame_cache: bool = True, precision: str = "fp16",
+                 cpu_threads: Optional[int] = None):
         """
         Args:
             gpu (bool): GPU kullanımı (varsayılan: True)
+            frame_cache (bool): Neredeyse aynı kareler için sonuç önbelleği
+                (OCRResultCache; kendi önbelleğini tutan çağıranlar kapatabilir)
+            precision (str): GPU çıkarım hassasiyeti; "fp16" TensorRT ile yarı
+                hassasiyet dener, "fp32" varsayılan Paddle Inference (varsayılan: "fp16")
+            cpu_threads (int): CPU modunda çıkarım thread sayısı
+                (varsayılan: çekirdek sayısının yarısı)
         """
         
 
         self.gpu = gpu
+        self.precision = precision
+        self.cpu_threads = max(1, cpu_threads or (os.cpu_count() or 1) // 2)
+        # CPU modunda oneDNN (MKL-DNN) çekirdekleri; PADDLE_OCR_MKLDNN=0 ile kapatılır
+        self.mkldnn = os.environ.get("PADDLE_OCR_MKLDNN", "1") != "0"
+        # Tanıma modeli (pipeline ve açı düzeltmedeki yeniden tanıma aynı modeli kullanır)
+        self.rec_model_name = REC_MODEL
+        # Gerçekte kullanılan hassasiyet (_init_ocr belirler)
+        self.active_precision = None
+        # Kare imzası → sonuçlar (engine ile aynı dHash + önizleme doğrulaması); None: kapalı
+        self._frame_cache = OCRResultCache(max_size=FRAME_CACHE_SIZE) if frame_cache else None
         self.ocr = None
         self._has_logged_resize = False
+        # (yükseklik, genişlik) → _plan_resize sonucu (videoda genelde tek giriş boyutu olur)
+        self._resize_plan_cache = {}
+        # (batch sırası, yükseklik, genişlik, kanal) → yeniden kullanılan resize tamponu
+        self._staging = {}
+        # (açı sınıflandırıcı, tanıyıcı) — ilk şüpheli satırda yüklenir (False: yüklenemedi)
+        self._orientation_models = None
+        # Batch karelerinin ön-işlemesi için thread havuzu
+        self._pre_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(PREPROCESS_WORKERS, os.cpu_count() or 1))
 
         
         self._init_ocr()
     
     def _init_ocr(self):
-        """PaddleOCR 3.1.0 motorunu başlatır (eski stabil akış)."""
+        """
+        PaddleOCR 3.1.0 motorunu başlatır
+
+        GPU'da (ve TensorRT kuruluysa) önce FP16 TensorRT denenir; olmazsa
+        varsayılan FP32 akışa dönülür. CPU modunda cihaz açıkça CPU seçilir
+        ve oneDNN (MKL-DNN) çekirdekleri sınırlı sayıda thread ile kullanılır.
+        TensorRT/oneDNN hataları kurulumda değil ilk çıkarımda da çıkabildiği
+        için ısınma turu bu denemelerin parçasıdır; başarısızsa FP32'ye dönülür.
+        """
         try:
             from paddleocr import PaddleOCR
             print("🔧 PaddleOCR 3.1.0 başlatılıyor...")
-            self.ocr = PaddleOCR(lang="tr", use_angle_cls=True)
-            print("🤖 PaddleOCR 3.1.0 başlatıldı (varsayılan ayarlar)")
+            # Açı sınıflandırıcısı her satırda çalışmaz; bkz. _fix_orientation
+            options = dict(text_detection_model_name=DET_MODEL,
+                           text_recognition_model_name=self.rec_model_name,
+                           use_angle_cls=False)
+
+            self.ocr = None
+            if self._use_fp16():
+                try:
+                    print("⏳ İlk çalıştırmada TensorRT motorları derlenir (birkaç dakika sürebilir)")
+                    self.ocr = self._build(PaddleOCR, **options, **self._device_options("fp16"))
+                    self._warmup()
+                    self.active_precision = "fp16"
+                except Exception as e:
+                    logger.warning("⚠️  FP16 (TensorRT) başlatılamadı: %s - FP32'ye dönülüyor", e)
+                    self.ocr = None
+
+            if not self.gpu and self.mkldnn:
+                try:
+                    self.ocr = self._build(PaddleOCR, **options, **self._device_options("fp32"))
+                    self._warmup()
+                    self.active_precision = "fp32"
+                except Exception as e:
+                    logger.warning("⚠️  MKL-DNN başlatılamadı: %s - varsayılan CPU akışına dönülüyor", e)
+                    self.mkldnn = False
+                    self.ocr = None
+
+            if self.ocr is None:
+                self.ocr = self._build(PaddleOCR, **options, **self._device_options("fp32"))
+                self.active_precision = "fp32"
+                try:
+                    self._warmup()
+                except Exception as e:
+                    logger.warning("⚠️  Isınma turu hatası: %s", e)
+            print(f"🤖 PaddleOCR 3.1.0 başlatıldı ({self.active_precision.upper()})")
         except ImportError:
             raise ImportError(
                 "PaddleOCR 3.1.0 bulunamadı. Kurulum için:\n"
                 "pip install paddlepaddle-gpu==3.1.0 paddleocr==3.1.0"
             )
         except Exception as e:
-            print(f"⚠️  PaddleOCR başlatma hatası: {e}")
+            logger.warning("⚠️  PaddleOCR başlatma hatası: %s", e)
             self.ocr = None
             return
 
+    def _device_options(self, precision: str) -> dict:
+        """
+        Modellerin cihaz/thread ayarlarını döner
+
+        Pipeline ve sonradan yüklenen yardımcı modeller (bkz. _init_orientation)
+        aynı ayarla kurulur. gpu=False iken cihaz açıkça CPU seçilir ki PaddleOCR
+        GPU'yu kendiliğinden seçmesin; thread sayısı ve oneDNN de buradan gelir.
+        """
+        if not self.gpu:
+            return dict(device="cpu", cpu_threads=self.cpu_threads, enable_mkldnn=self.mkldnn)
+        if precision == "fp16":
+            return dict(device="gpu", use_tensorrt=True, precision="fp16")
+        return {}
+
+    def _build(self, factory, **options):
+        """
+        PaddleOCR'ı predictor içi skor eşiği olmadan kurar
+
+        Ters (180°) satırlar genelde en düşük skoru alır; predictor bunları
+        atarsa açı düzeltmeye (bkz. _fix_orientation) hiç ulaşmazlar. Bu yüzden
+        eşik açıkça 0 verilir ve MIN_SCORE açı düzeltmeden sonra uygulanır
+        (bkz. _finish_page). Bu ayarı tanımayan sürümlerde ayarsız kurulur.
+        """
+        try:
+            return factory(**options, text_rec_score_thresh=0.0)
+        except (TypeError, ValueError) as e:
+            logger.warning("⚠️  text_rec_score_thresh desteklenmiyor (%s) - ayarsız başlatılıyor", e)
+            return factory(**options)
+
+    def _warmup(self):
+        """
+        Motoru sahte karelerle bir kez çalıştırır
+
+        İlk çıkarım (CUDA bağlamı, cuDNN ayarı, ağırlık yükleme) çok daha
+        yavaştır; bu maliyet ilk gerçek kare yerine başlatmada ödenir.
+        İkinci karedeki yazı tanıma modelinin de ısınmasını sağlar.
+        Çıkarım hatası yukarı iletilir (bkz. _init_ocr).
+        """
+        small = np.zeros((64, 128, 3), np.uint8)
+        large = np.zeros((640, 640, 3), np.uint8)
+        cv2.putText(large, "Warm up 123", (40, 320), cv2.FONT_HERSHEY_SIMPLEX,
+                    2, (255, 255, 255), 4)
+        start = time.perf_counter()
+        self.ocr.predict(input=small)
+        self.ocr.predict(input=large)
+        print(f"🔥 Isınma turu tamamlandı ({time.perf_counter() - start:.2f}s)")
+
+    def _use_fp16(self) -> bool:
+        """FP16 (TensorRT) yolunun denenip denenmeyeceğini döner"""
+        return (self.precision == "fp16" and self.gpu and self.check_gpu_availability()
+                and importlib.util.find_spec("tensorrt") is not None)
+
     def recognize(
         self,
         frame: np.ndarray,
     ) -> Iterator[Tuple[Tuple[float, float, float, float], str, float]]:
+        """Tek kareyi tanır (geriye uyumluluk için 1 karelik batch)"""
+        yield from self.recognize_batch([frame])[0]
+
+    def recognize_batch(
+        self,
+        frames: List[np.ndarray],
+    ) -> List[List[Tuple[Tuple[float, float, float, float], str, float]]]:
+        """
+        Birden fazla kareyi tek predict çağrısıyla tanır
+
+        Model çağrı maliyeti (kernel başlatma, Python↔C++ geçişi) kareler
+        arasında paylaşıldığı için tek tek recognize'dan daha hızlıdır.
+
+        Args:
+            frames (list): İşlenecek görüntü kareleri
+
+        Returns:
+            list: Her kare için (bbox, text, confidence) listesi (giriş sırasıyla)
+        """
+        if not frames:
+            return []
+
         if self.ocr is None:
             self._init_ocr()
             if self.ocr is None:
+                return [[] for _ in frames]
+
+        # Neredeyse aynı kareler önbellekten gelir, OCR'a sadece kalanlar gider
+        sigs = [self._signature(frame) for frame in frames]
+        results = [self._cached(sig) for sig in sigs]
+        misses = []
+        dupes = {}  # batch içinde tekrar eden kare → ilk kopyası
+        for i, (sig, res) in enumerate(zip(sigs, results)):
+            if res is not None:
+                continue
+            j = self._find_dupe(sig, [(m, sigs[m]) for m in misses])
+            if j is not None:
+                dupes[i] = j
+                continue
+            misses.append(i)
+        if not misses:
+            return results
+
+        # Her batch sırası kendi resize tamponunu tekrar kullanır (sıralar farklı
+        # tampona yazdığı için kareler thread havuzunda paralel işlenebilir)
+        if len(misses) > 1:
+            procs = list(self._pre_pool.map(
+                lambda slot: self.preprocess_frame(frames[misses[slot]], slot=slot),
+                range(len(misses))))
+        else:
+            procs = [self.preprocess_frame(frames[misses[0]], slot=0)]
+
+        # Not: kareler predict'e normal (pageable) numpy dizisi olarak verilir.
+        # PaddleOCR, det/rec girişlerini CPU'da yeniden boyutlandırıp float32'ye
+        # normalize ettikten sonra GPU'ya kopyalar; bu dizilerin pinned bellekte
+        # tutulması, GPU'ya giden tensörlere ulaşmadığı için hız kazandırmaz.
+
+        for i, res in zip(misses, self._recognize_preprocessed(procs)):
+            results[i] = res
+            self._remember(sigs[i], res)
+        for i, j in dupes.items():
+            results[i] = list(results[j])
+        return results
+
+    def _recognize_preprocessed(
+        self,
+        procs: List[np.ndarray],
+    ) -> List[List[Tuple[Tuple[float, float, float, float], str, float]]]:
+        """
+        Ön-işlenmiş kareleri tanır (predict + çözümleme + açı düzeltme)
+
+        Önbellek ve ön-işleme atlanır; benchmark sadece çıkarımı ölçmek için kullanır.
+        """
+        pages = self._decode_pages(self._predict_pages(procs), min_score=0.0)
+        return [self._finish_page(proc, res) for proc, res in zip(procs, pages)]
+
+    def _finish_page(
+        self,
+        image: np.ndarray,
+        results: List[Tuple[Tuple[float, float, float, float], str, float]],
+    ) -> List[Tuple[Tuple[float, float, float, float], str, float]]:
+        """Açı düzeltmeyi uygular, ardından MIN_SCORE altındaki satırları atar"""
+        return [res for res in self._fix_orientation(image, results) if res[2] >= MIN_SCORE]
+
+    def _signature(self, frame: np.ndarray):
+        """Karenin (dHash, önizleme) imzasını döner (önbellek kapalıysa None)"""
+        if self._frame_cache is None or frame is None or frame.size == 0:
+            return None
+        return frame_signature(frame)
+
+    def _find_dupe(self, sig, candidates) -> Optional[int]:
+        """Adaylar ((sıra, imza) listesi) içinde aynı kareyi bulup sırasını döner"""
+        if sig is None:
+            return None
+        key, thumb = sig
+        return next((i for i, other in candidates if other is not None
+                     and hamming(key, other[0]) <= self._frame_cache.tolerance
+                     and same_frame(thumb, other[1])), None)
+
+    def _cached(self, sig):
+        """İmzaya ait sonuçların kopyasını döner (yoksa None)"""
+        if sig is None:
+            return None
+        res = self._frame_cache.get(*sig)
+        return list(res) if res is not None else None
+
+    def _remember(self, sig, results):
+        """Sonuçları önbelleğe ekler; en eski kayıt atılır"""
+        if sig is not None:
+            self._frame_cache.put(*sig, list(results))
+
+    def _predict_pages(self, procs: List[np.ndarray]) -> list:
+        """
+        Ön-işlenmiş kareleri tek predict çağrısıyla çalıştırır
+
+        Returns:
+            list: Her kare için bir sayfa (hata ya da eksik sayfada boş dict)
+        """
+        try:
+            pages = list(self.ocr.predict(input=procs) or [])
+        except Exception as e:
+            _warn_once(f"⚠️  predict hatası: {e}")
+            pages = []
+
+        # Eksik sayfa dönerse kare sayısına tamamla
+        pages.extend({} for _ in range(len(procs) - len(pages)))
+        return pages
+
+    def start_pipeline(
+        self,
+        frame_iter: Iterable[np.ndarray],
+        batch_size: int = 16,
+        timeout_ms: int = 20,
+    ) -> Iterator[Tuple[int, List[Tuple[Tuple[float, float, float, float], str, float]]]]:
+        """
+        Kareleri aşamalı (thread'li) bir pipeline ile tanır
+
+        Ön-işleme → predict → sonuç çözümleme ayrı thread'lerde çalışır ve
+        küçük sınırlı kuyruklarla bağlanır. predict C++ tarafında GIL'i
+        bıraktığı için CPU aşamaları model çalışırken ilerler.
+
+        Args:
+            frame_iter (iterable): İşlenecek görüntü kareleri
+            batch_size (int): Tek predict çağrısındaki en fazla kare (varsayılan: 16)
+            timeout_ms (int): Batch dolmadan beklenecek en uzun süre (varsayılan: 20 ms)
+
+        Yields:
+            tuple: (kare_sırası, [(bbox, text, confidence), ...]) — giriş sırasıyla
+        """
+        if self.ocr is None:
+            self._init_ocr()
+            if self.ocr is None:
+                for i, _ in enumerate(frame_iter):
+                    yield i, []
                 return
 
-        # 1) Ön-işleme
-        proc = self.preprocess_frame(frame)
+        batch_size = max(1, batch_size)
+        timeout = max(1, timeout_ms) / 1000
+        q_pre = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)   # (sıra, ön-işlenmiş kare)
+        q_post = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)  # (sıralar, sayfalar)
+        q_out = queue.Queue(maxsize=batch_size)            # (sıra, sonuçlar)
+        stop = threading.Event()
+        errors = []
+
+        def _preprocess():
+            try:
+                for i, frame in enumerate(frame_iter):
+                    # Kareler kuyrukta beklediği için paylaşılan tampon (slot) kullanılmaz
+                    if not _put(q_pre, (i, self.preprocess_frame(frame)), stop):
+                        return
+            except Exception as e:
+                errors.append(e)
+            finally:
+                _put(q_pre, _EOF, stop)
+
+        def _predict():
+            batch = []
+
+            def _flush():
+                ids, procs = zip(*batch)
+                batch.clear()
+                return _put(q_post, (ids, procs, self._predict_pages(list(procs))), stop)
+
+            try:
+                while not stop.is_set():
+                    # Batch dolmasa da timeout sonunda bekleyen kareler işlenir
+                    try:
+                        item = q_pre.get(timeout=timeout)
+                    except queue.Empty:
+                        if batch and not _flush():
+                            return
+                        continue
+
+                    if item is _EOF:
+                        if batch:
+                            _flush()
+                        return
+
+                    batch.append(item)
+                    if len(batch) >= batch_size and not _flush():
+                        return
+            except Exception as e:
+                errors.append(e)
+            finally:
+                _put(q_post, _EOF, stop)
+
+        def _decode():
+            try:
+                while True:
+                    item = _get(q_post, stop)
+                    if item is _EOF:
+                        return
+                    ids, procs, pages = item
+                    for i, proc, res in zip(ids, procs, self._decode_pages(pages, min_score=0.0)):
+                        results = self._finish_page(proc, res)
+                        if not _put(q_out, (i, results), stop):
+                            return
+            except Exception as e:
+                errors.append(e)
+            finally:
+                _put(q_out, _EOF, stop)
 
-    # 2) OCR çağrısı (ESKİ: predict)
+        workers = [threading.Thread(target=fn, daemon=True)
+                   for fn in (_preprocess, _predict, _decode)]
+        for worker in workers:
+            worker.start()
+
+        try:
+            while True:
+                item = q_out.get()
+                if item is _EOF:
+                    break
+                yield item
+        finally:
+            # Tüketici erken bırakırsa thread'ler kuyrukta kilitlenmeden çıkar
+            stop.set()
+
+        for worker in workers:
+            worker.join()
+        if errors:
+            raise errors[0]
+
+    def _fix_orientation(
+        self,
+        image: np.ndarray,
+        results: List[Tuple[Tuple[float, float, float, float], str, float]],
+    ) -> List[Tuple[Tuple[float, float, float, float], str, float]]:
+        """
+        Şüpheli satırları (dikey ya da düşük skorlu) açı sınıflandırıcısından geçirir
+
+        Satırların büyük çoğunluğu düz olduğu için sınıflandırıcı her satırda
+        değil, sadece bu satırlarda toplu çalışır. Ters (180°) bulunan satırlar
+        döndürülüp yeniden tanınır; yeni skor daha yüksekse sonuç güncellenir.
+
+        Args:
+            image (np.ndarray): predict'e verilen (ön-işlenmiş) kare
+            results (list): Karenin (bbox, text, confidence) sonuçları
+
+        Returns:
+            list: Güncellenmiş sonuçlar
+        """
+        crops, suspects = [], []
+        for i, ((x1, y1, x2, y2), _, score) in enumerate(results):
+            if score >= ORIENT_SCORE and (y2 - y1) <= ORIENT_ASPECT * (x2 - x1):
+                continue
+            crop = image[max(0, int(y1)):int(np.ceil(y2)), max(0, int(x1)):int(np.ceil(x2))]
+            if crop.size == 0:
+                continue
+            # PaddleOCR gibi: dikey satırlar tanımadan önce 90° çevrilir
+            if crop.shape[0] >= ORIENT_ASPECT * crop.shape[1]:
+                crop = np.rot90(crop)
+            crops.append(np.ascontiguousarray(crop))
+            suspects.append(i)
+
+        if not suspects or not self._init_orientation():
+            return results
+
+        cls_model, rec_model = self._orientation_models
         try:
-            pages = self.ocr.predict(input=proc)
+            labels = [str(res["label_names"][0]) for res in cls_model.predict(input=crops)]
+            flipped = [(i, cv2.rotate(crop, cv2.ROTATE_180))
+                       for i, crop, label in zip(suspects, crops, labels)
+                       if label.startswith("180")]
+            if not flipped:
+                return results
+
+            recs = rec_model.predict(input=[crop for _, crop in flipped])
+            for (i, _), res in zip(flipped, recs):
+                txt, score = str(res["rec_text"]).strip(), float(res["rec_score"])
+                if txt and score > results[i][2]:
+                    results[i] = (results[i][0], txt, score)
         except Exception as e:
-            print("⚠️  predict hatası:", e)
-            return
+            _warn_once(f"⚠️  Açı düzeltme hatası: {e}")
+        return results
 
-        if not pages:
-            return
+    def _init_orientation(self) -> bool:
+        """Açı sınıflandırıcısını ve yeniden tanıma modelini ilk ihtiyaçta yükler"""
+        if self._orientation_models is None:
+            try:
+                from paddleocr import TextLineOrientationClassification, TextRecognition
+                # Pipeline ile aynı tanıma modeli ve aynı cihaz/thread ayarları
+                device = self._device_options(self.active_precision)
+                self._orientation_models = (
+                    TextLineOrientationClassification(**device),
+                    TextRecognition(model_name=self.rec_model_name, **device))
+                print("🔄 Açı sınıflandırıcısı yüklendi (sadece şüpheli satırlar için)")
+            except Exception as e:
+                logger.warning("⚠️  Açı sınıflandırıcısı yüklenemedi: %s", e)
+                self._orientation_models = False
+        return bool(self._orientation_models)
+
+    def _decode_pages(
+        self,
+        pages: list,
+        min_score: float = MIN_SCORE,
+    ) -> List[List[Tuple[Tuple[float, float, float, float], str, float]]]:
+        """
+        Bir batch'in predict sayfalarını (bbox, text, confidence) sonuçlarına çevirir
 
-    # 3) Sonuçları çözüp yield et
-        for page in pages:
-            res = page.get("res", page)
-            polys  = res.get("dt_polys", [])
-            texts  = res.get("rec_texts", [])
-            scores = res.get("rec_scores", [])
+        Tüm sayfaların tespitleri tek diziye düzleştirilir; skor filtresi ve
+        bbox min/max'ı sayfa sayfa değil, batch genelinde tek seferde hesaplanır.
 
-            for poly, txt, score in zip(polys, texts, scores):
-                if not txt or score < 0.30:
-                    continue
-                xs = [p[0] for p in poly]
-                ys = [p[1] for p in poly]
-                bbox = (float(min(xs)), float(min(ys)),
-                    float(max(xs)), float(max(ys)))
-                yield bbox, txt.strip(), float(score)
+        Args:
+            pages (list): predict sayfaları
+            min_score (float): En düşük skor; açı düzeltme yapılacaksa 0 verilir
+                ve eşik sonradan uygulanır (bkz. _finish_page)
 
+        Returns:
+            list: Her sayfa için sonuç listesi (giriş sırasıyla)
+        """
+        results = [[] for _ in pages]
+        fields = [_page_fields(page) for page in pages]
+        counts = [min(map(len, f)) if f is not None else 0 for f in fields]
+        total = sum(counts)
+        if total == 0:
+            return results
 
-    
-    def preprocess_frame(self, frame: np.ndarray) -> np.ndarray:
+        # Tüm sayfaların tespitleri tek düz listeye
+        page_ids = np.repeat(np.arange(len(pages)), counts).tolist()
+        polys = [poly for f, n in zip(fields, counts) if n for poly in f[0][:n]]
+        texts = [txt for f, n in zip(fields, counts) if n for txt in f[1][:n]]
+        scores = np.fromiter((score for f, n in zip(fields, counts) if n for score in f[2][:n]),
+                             dtype=np.float64, count=total)
+
+        # Skor/boş metin filtresi ve bbox min/max tek geçişte: (N, köşe, 2) → (M, 4)
+        corners = _stack_polys(polys)
+        if corners is not None:
+            boxes, kept = _bboxes_from_polys(corners, scores, texts, min_score)
+        else:
+            # Köşe sayıları farklı (poligon kutular) → kutu kutu hesapla
+            boxes, kept = _bboxes_from_ragged(polys, scores, texts, min_score)
+
+        # Sadece tutulan kutuların skorları Python float'a çevrilir
+        for k, score, (x1, y1, x2, y2) in zip(kept.tolist(), scores[kept].tolist(),
+                                              boxes.tolist()):
+            results[page_ids[k]].append(((x1, y1, x2, y2), texts[k].strip(), score))
+        return results
+
+    def preprocess_frame(self, frame: np.ndarray, slot: Optional[int] = None) -> np.ndarray:
         """
         Görüntü ön işleme - OCR kalitesini artırır
         
         Args:
             frame (np.ndarray): Ham görüntü
+            slot (int): Batch içindeki sıra; verilirse resize sonucu bu sıraya
+                ait önceden ayrılmış tampona yazılır (her karede yeni dizi ayrılmaz).
+                Tampon bir sonraki batch'te üzerine yazılır.
             
         Returns:
             np.ndarray: İyileştirilmiş görüntü
         """
         if frame is None or frame.size == 0:
-            print("⚠️  Boş frame alındı")
+            _warn_once("⚠️  Boş frame alındı")
             return frame
         
         try:
             # Görüntü boyutu kontrolü
             height, width = frame.shape[:2]
             
-            # Çok küçük görüntüleri büyüt (PaddleOCR 3.x için optimize edildi)
-            if height < 32 or width < 32:
-                scale_factor = max(64/height, 64/width)
-                new_width = int(width * scale_factor)
-                new_height = int(height * scale_factor)
-                frame = cv2.resize(frame, (new_width, new_height), interpolation=cv2.INTER_CUBIC)
-                if not self._has_logged_resize:
-                    print(f"🔍 Frame büyütüldü: {width}x{height} → {new_width}x{new_height}")
-                    self._has_logged_resize = True
-            
-            # Çok büyük görüntüleri küçült (performans ve bellek için)
-            elif height > 1080 or width > 1920:
-                scale_factor = min(1080/height, 1920/width)
-                new_width = int(width * scale_factor)
-                new_height = int(height * scale_factor)
-                frame = cv2.resize(frame, (new_width, new_height), interpolation=cv2.INTER_AREA)
+            plan = self._resize_plan_cache.get((height, width))
+            if plan is None:
+                plan = self._resize_plan_cache[(height, width)] = _plan_resize(
+                    height, width, *MAX_INPUT_SIZE)
+            new_width, new_height, code = plan
+            if code != RESIZE_NONE:
+                interpolation = cv2.INTER_LINEAR if code == RESIZE_UP else cv2.INTER_AREA
+                frame = cv2.resize(frame, (new_width, new_height),
+                                   dst=self._staging_buffer(slot, frame, new_width, new_height),
+                                   interpolation=interpolation)
+                if code == RESIZE_UP:
+                    # CUBIC yerine LINEAR + unsharp mask: daha ucuz, harf kenarları keskin
+                    blurred = cv2.GaussianBlur(frame, (0, 0), UNSHARP_SIGMA)
+                    cv2.addWeighted(frame, 1 + UNSHARP_AMOUNT, blurred, -UNSHARP_AMOUNT, 0,
+                                    dst=frame)
                 if not self._has_logged_resize:
-                    print(f"🔍 Frame küçültüldü: {width}x{height} → {new_width}x{new_height}")
+                    action = "büyütüldü" if code == RESIZE_UP else "küçültüldü"
+                    logger.info("🔍 Frame %s: %dx%d → %dx%d", action, width, height, new_width, new_height)
                     self._has_logged_resize = True
             
             # Görüntü kalitesi iyileştirme (isteğe bağlı)
             # frame = cv2.bilateralFilter(frame, 9, 75, 75)  # Gürültü azaltma
             
-            return frame
+            # Kırpılmış/dilimlenmiş görünümler Paddle içinde gizli bir kopyaya yol
+            # açmasın diye kare bitişik (C-contiguous) verilir; zaten bitişikse kopya yok
+            return np.ascontiguousarray(frame)
             
         except Exception as e:
-            print(f"⚠️  Preprocessing hatası: {e}")
+            _warn_once(f"⚠️  Preprocessing hatası: {e}")
             return frame
     
+    def _staging_buffer(self, slot: Optional[int], frame: np.ndarray,
+                        width: int, height: int) -> Optional[np.ndarray]:
+        """Batch sırasına ait resize hedef tamponunu döner (slot yoksa None)"""
+        if slot is None:
+            return None
+        shape = (height, width) + frame.shape[2:]
+        key = (slot,) + shape
+        buf = self._staging.get(key)
+        if buf is None or buf.dtype != frame.dtype:
+            buf = self._staging[key] = np.empty(shape, frame.dtype)
+        return buf
+
     def set_language(self, language: str):
         """
         OCR dilini değiştirir - PaddleOCR 3.x'te yeniden başlatma gerekiyor
@@ -153,7 +796,7 @@ class PaddleOCRWrapper(BaseOCR):
         Args:
             language (str): Yeni dil kodu (bu sürümde kullanılmaz)
         """
-        print(f"⚠️  Dil değiştirme bu sürümde desteklenmiyor - varsayılan model kullanılır")
+        logger.warning("⚠️  Dil değiştirme bu sürümde desteklenmiyor - varsayılan model kullanılır")
     
     def get_supported_languages(self) -> List[str]:
         """
@@ -180,16 +823,22 @@ class PaddleOCRWrapper(BaseOCR):
             'version': '3.1.0',
             'language': 'auto',  # Otomatik dil tespiti
             'gpu': self.gpu,
+            # CPU modunda oneDNN JIT (AVX2/AVX-512) çekirdekleri referans
+            # çekirdeklere göre belirgin şekilde daha yüksek kare/saniye verir
+            'mkldnn': not self.gpu and self.mkldnn,
+            'cpu_threads': None if self.gpu else self.cpu_threads,
+            'backend': 'tensorrt' if self.active_precision == 'fp16' else 'paddle',
+            'precision': self.active_precision,
             'supported_languages': self.get_supported_languages(),
             'models': {
-                'detection': 'PP-OCRv5_server_det', 
-                'recognition': 'PP-OCRv5_server_rec',  # server_rec daha iyi
+                'detection': DET_MODEL,
+                'recognition': self.rec_model_name,
                 'classification': 'PP-LCNet_x1_0_textline_ori'
             },
             'features': {
                 'text_detection': True,
                 'text_recognition': True,
-                'angle_classification': True,
+                'angle_classification': True,  # sadece dikey/düşük skorlu satırlarda
                 'multi_language': True,
                 'pp_ocrv5': True,
                 'auto_download': True,  # Modeller otomatik indiriliyor
@@ -207,21 +856,21 @@ class PaddleOCRWrapper(BaseOCR):
         Returns:
             dict: Performans metrikleri
         """
-        import time
-        
         times = []
         detection_counts = []
         
         print(f"🧪 PaddleOCR 3.1.0 performans testi ({iterations} iterasyon)...")
         
-        # İlk çağrı genelde yavaş oluyor (model yükleme)
-        print("🔥 Isınma turu...")
-        list(self.recognize(test_image))
-        
+        if self.ocr is None:
+            self._init_ocr()
+
+        # Isınma turu _init_ocr'da yapıldı (bkz. _warmup). Ön-işleme bir kez
+        # yapılır ve önbellek atlanır → döngü sadece çıkarımı ölçer
+        proc = self.preprocess_frame(test_image)
         for i in range(iterations):
-            start_time = time.time()
-            results = list(self.recognize(test_image))
-            end_time = time.time()
+            start_time = time.perf_counter()
+            results = self._recognize_preprocessed([proc])[0] if self.ocr is not None else []
+            end_time = time.perf_counter()
             
             times.append(end_time - start_time)
             detection_counts.append(len(results))
@@ -243,6 +892,12 @@ class PaddleOCRWrapper(BaseOCR):
             'throughput_fps': 1.0 / avg_time if avg_time > 0 else 0
         }
     
+    def __del__(self):
+        """Destructor - ön-işleme thread havuzunu kapatır"""
+        pool = getattr(self, "_pre_pool", None)
+        if pool is not None:
+            pool.shutdown(wait=False)
+
     def check_gpu_availability(self) -> bool:
         """
         GPU kullanılabilirliğini kontrol eder
@@ -250,11 +905,7 @@ class PaddleOCRWrapper(BaseOCR):
         Returns:
             bool: GPU kullanılabilir mi?
         """
-        try:
-            import paddle
-            return paddle.device.is_compiled_with_cuda() and paddle.device.cuda.device_count() > 0
-        except:
-            return False
+        return _gpu_available()
     
     def get_model_download_info(self) -> dict:
         """
@@ -270,8 +921,8 @@ class PaddleOCRWrapper(BaseOCR):
                 'PP-LCNet_x1_0_doc_ori',
                 'UVDoc', 
                 'PP-LCNet_x1_0_textline_ori',
-                'PP-OCRv5_server_det',
-                'PP-OCRv5_server_rec'  # server_rec daha kaliteli
+                DET_MODEL,
+                REC_MODEL,
             ],
             'note': 'Modeller ilk kullanımda otomatik indirilir ve cache\'lenir'
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,111 @@
+"""
+Aktif Bölge (ROI) Takibi - OCR'ı sadece hareketli yatay banda uygular
+
+Altyazı ve alt yazı bantları gibi videolarda metin genellikle karenin dar
+bir yatay şeridinde değişir. Kareler arası satır bazlı fark biriktirilerek
+bu şerit bulunur ve OCR'a sadece o bölge verilir.
+"""
+
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Bandın kaç örneklenmiş karede bir yeniden hesaplanacağı
+ROI_WINDOW = 50
+
+# Bir satırın "aktif" sayılması için gereken ortalama fark (0-255)
+ROW_THRESHOLD = 2.0
+
+# Bu ortalama farkın üstü sahne değişimi sayılır → tam kareye dön
+SCENE_THRESHOLD = 40.0
+
+# Bandın üstüne/altına eklenen pay (piksel)
+ROI_MARGIN = 16
+
+# Fark hesabı için kullanılan küçültülmüş genişlik
+_PROBE_WIDTH = 160
+
+
+class RoiTracker:
+    """
+    Kareler arası harekete göre aktif yatay bandı takip eder
+
+    Özellikler:
+    - Satır bazlı absdiff ile ucuz hareket maskesi
+    - Her ROI_WINDOW karede bir bandı günceller
+    - Sahne değişiminde tam kareye geri döner
+    """
+
+    def __init__(self, window: int = ROI_WINDOW, row_threshold: float = ROW_THRESHOLD,
+                 scene_threshold: float = SCENE_THRESHOLD, margin: int = ROI_MARGIN):
+        """
+        Args:
+            window (int): Bandın yeniden hesaplanma aralığı (kare)
+            row_threshold (float): Aktif satır eşiği
+            scene_threshold (float): Sahne değişimi eşiği
+            margin (int): Banda eklenen pay (piksel)
+        """
+        self.window = max(1, window)
+        self.row_threshold = row_threshold
+        self.scene_threshold = scene_threshold
+        self.margin = margin
+
+        self._prev: Optional[np.ndarray] = None
+        self._activity: Optional[np.ndarray] = None
+        self._seen = 0
+        self._band: Optional[Tuple[int, int]] = None
+
+    def update(self, frame: np.ndarray) -> Tuple[int, int]:
+        """
+        Kareyi harekete dahil eder ve kullanılacak bandı döner
+
+        Args:
+            frame (np.ndarray): BGR kare
+
+        Returns:
+            tuple: (y_üst, y_alt) — tam kare için (0, yükseklik)
+        """
+        height = frame.shape[0]
+        probe_h = max(1, height // 4)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        small = cv2.resize(gray, (_PROBE_WIDTH, probe_h), interpolation=cv2.INTER_AREA)
+
+        if self._prev is None or self._prev.shape != small.shape:
+            self._reset(small)
+            return 0, height
+
+        rows = cv2.absdiff(self._prev, small).mean(axis=1)
+        self._prev = small
+
+        # Büyük sahne değişimi → biriken maske geçersiz
+        if rows.mean() > self.scene_threshold:
+            self._reset(small)
+            return 0, height
+
+        np.maximum(self._activity, rows, out=self._activity)
+        self._seen += 1
+        if self._seen >= self.window:
+            self._band = self._compute_band(height)
+            self._activity[:] = 0
+            self._seen = 0
+
+        return self._band if self._band is not None else (0, height)
+
+    def _compute_band(self, height: int) -> Optional[Tuple[int, int]]:
+        """Biriken satır aktivitesinden bandı hesaplar (aktivite yoksa None)"""
+        active = np.flatnonzero(self._activity > self.row_threshold)
+        if active.size == 0:
+            return None
+
+        scale = height / len(self._activity)
+        y_top = max(0, int(active[0] * scale) - self.margin)
+        y_bottom = min(height, int((active[-1] + 1) * scale) + self.margin)
+        return y_top, y_bottom
+
+    def _reset(self, small: np.ndarray):
+        """Takibi sıfırlar (ilk kare ya da sahne değişimi)"""
+        self._prev = small
+        self._activity = np.zeros(small.shape[0], np.float64)
+        self._seen = 0
+        self._band = None